@@ -0,0 +1,102 @@
+"""
+Бенчмарк времени импорта модулей проекта
+========================================
+
+Каждый модуль импортируется в отдельном чистом интерпретаторе (холодный старт),
+замеряется время импорта и проверяется, что тяжелые зависимости (statsmodels,
+plotly, ipywidgets, IPython, digger, tqdm) не подгружаются раньше первого
+использования. Результат сравнивается с бюджетом времени запуска, чтобы
+регрессии (новый тяжелый импорт на верхнем уровне модуля) ловились сразу.
+
+Запуск из корня проекта:
+    python -m Benchmarks.import_time_benchmark
+
+Код возврата 1, если хотя бы один модуль превысил бюджет или подгрузил
+запрещенную зависимость.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pandas as pd
+
+# Бюджет времени импорта в секундах (с запасом на медленные машины)
+IMPORT_BUDGETS = {
+    'Statistics.stat_test_methods': 1.5,
+    'Statistics.statistics': 1.5,
+    'ExperimentsCore.experiments_core': 1.5,
+    'ExperimentsCore.experiments_engine': 2.0,
+    'ExperimentsCore.__main__': 2.0,
+    'DataLoader.data_loader': 1.0,
+    'DataVisualizations.visualizations': 1.0,
+    'DataVisualizations.means_vis_bootstrap': 2.0,
+    'EDA.EDA': 1.5,
+}
+
+# Зависимости, которые не должны загружаться при импорте модулей из IMPORT_BUDGETS
+DEFERRED_MODULES = ('statsmodels', 'plotly', 'ipywidgets', 'IPython', 'digger', 'tqdm')
+
+# Код, выполняемый в дочернем интерпретаторе
+_PROBE = """
+import importlib, json, sys, time
+start = time.perf_counter()
+importlib.import_module({module!r})
+seconds = time.perf_counter() - start
+loaded = sorted({{name.split('.')[0] for name in sys.modules}} & set({deferred!r}))
+print(json.dumps({{'seconds': seconds, 'loaded': loaded}}))
+"""
+
+
+def measure_import(module, deferred=DEFERRED_MODULES):
+    """
+    Импортирует модуль в чистом интерпретаторе.
+
+    Возвращает:
+    dict
+        seconds - время импорта, loaded - загруженные отложенные зависимости
+    """
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    completed = subprocess.run(
+        [sys.executable, '-c', _PROBE.format(module=module, deferred=list(deferred))],
+        cwd=project_root, capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Не удалось импортировать {module}:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def best_import(module, repeats=3):
+    """
+    Минимальное время импорта из нескольких холодных запусков.
+    """
+    measurements = [measure_import(module) for _ in range(repeats)]
+    return min(measurements, key=lambda measurement: measurement['seconds'])
+
+
+def run_benchmark(budgets=IMPORT_BUDGETS, repeats=3):
+    """
+    Замеряет время импорта каждого модуля и сверяет с бюджетом.
+
+    Возвращает:
+    pd.DataFrame
+        Колонки: module, seconds, budget, loaded_deferred, ok
+    """
+    rows = []
+    for module, budget in budgets.items():
+        measurement = best_import(module, repeats)
+        rows.append({
+            'module': module,
+            'seconds': measurement['seconds'],
+            'budget': budget,
+            'loaded_deferred': ', '.join(measurement['loaded']),
+            'ok': measurement['seconds'] <= budget and not measurement['loaded'],
+        })
+    return pd.DataFrame(rows)
+
+
+if __name__ == '__main__':
+    results = run_benchmark()
+    print(results.to_string(index=False))
+    sys.exit(0 if results['ok'].all() else 1)
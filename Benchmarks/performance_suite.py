@@ -0,0 +1,349 @@
+"""
+Набор бенчмарков движка, построения распределения и EDA
+=======================================================
+
+Воспроизводимые замеры основных операций проекта на синтетических данных
+(ряды из sampler_benchmark.synthetic_series с фиксированным seed):
+- 'engine': run_experiment для одного размера выборки по сетке
+  (распределение × движок × размер выборки × число эмуляций)
+- 'distribution': discrete_dist_creation
+- 'eda': EDA.EDA (статистики, PDF и фигуры plotly)
+- 'means': visualize_means_distribution по сетке размеров выборки и числа бутстрэпов
+
+Распределения различаются размером носителя: 'binary' (конверсия, 2 значения),
+'poisson' (счетчик, ~десяток значений), 'revenue' (выручка с тяжелым хвостом,
+тысячи значений). Для каждого замера сохраняются время (лучшее из repeats
+запусков), пропускная способность (эмуляций или строк в секунду) и пиковая
+память по tracemalloc (отдельный запуск: трассировка замедляет код).
+
+Результаты записываются в CSV (по умолчанию в ~/.cache/mde_calculator/benchmarks)
+с коммитом, временем и версиями python/numpy, чтобы запуски можно было сравнить:
+--compare сопоставляет текущий запуск с сохраненным по ключевым колонкам и
+помечает замедления больше REGRESSION_THRESHOLD.
+
+Запуск из корня проекта:
+    python -m Benchmarks.performance_suite
+    python -m Benchmarks.performance_suite --quick --only engine means
+    python -m Benchmarks.performance_suite --compare ~/.cache/mde_calculator/benchmarks/<файл>.csv
+
+Код возврата 1, если при сравнении найдено замедление.
+"""
+
+import argparse
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from Benchmarks.sampler_benchmark import best_time, synthetic_series
+from ExperimentsCore.experiments_core import discrete_dist_creation
+from ExperimentsCore.discrete_sampler import DiscreteSampler
+from ExperimentsCore.experiments_engine import run_experiment
+from EDA.EDA import EDA
+from DataVisualizations.means_vis_bootstrap import visualize_means_distribution
+
+# Сетки параметров: полный набор и быстрый (для проверки перед коммитом)
+GRIDS = {
+    'full': {
+        'distributions': ('binary', 'poisson', 'revenue'),
+        'sample_sizes': (1_000, 10_000, 100_000),
+        'num_emulations': (1_000, 10_000),
+        'data_size': 1_000_000,
+    },
+    'quick': {
+        'distributions': ('binary', 'poisson', 'revenue'),
+        'sample_sizes': (1_000, 10_000),
+        'num_emulations': (1_000,),
+        'data_size': 200_000,
+    },
+}
+
+# Движки эмуляции в замерах ('loop' не входит: на полной сетке он идет часами)
+ENGINES = ('batch', 'multinomial', 'binomial')
+
+# Базовая конфигурация эксперимента (размер выборки и число эмуляций задаются сеткой)
+BASE_CONFIG = {
+    'alpha': 0.05,
+    'target_power': 0.8,
+    'mde_percent': 5,
+    'statistic': 'mean',
+    'test_method': 't_test',
+    'seed': 1,
+}
+
+# Колонки, по которым сопоставляются замеры разных запусков
+KEY_COLUMNS = ['benchmark', 'distribution', 'engine', 'sample_size', 'num_emulations']
+
+# Относительное замедление, которое считается регрессией при сравнении запусков
+REGRESSION_THRESHOLD = 0.1
+
+RESULTS_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'mde_calculator', 'benchmarks')
+
+
+def peak_memory_mb(function):
+    """
+    Пиковая память, выделенная функцией (Python и numpy), по tracemalloc, в МБ.
+    """
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 2 ** 20
+
+
+def measure(function, throughput_items, throughput_unit, repeats=3):
+    """
+    Замеряет время, пропускную способность и пиковую память функции.
+
+    Возвращает:
+    dict
+        seconds, throughput, throughput_unit, peak_memory_mb
+    """
+    seconds = best_time(function, repeats)
+    return {
+        'seconds': seconds,
+        'throughput': throughput_items / seconds,
+        'throughput_unit': throughput_unit,
+        'peak_memory_mb': peak_memory_mb(function),
+    }
+
+
+def engine_cases(distributions, grid):
+    """
+    Замеры run_experiment: одна точка кривой мощности на каждый размер выборки.
+    """
+    for kind, (series, sampler) in distributions.items():
+        for engine in ENGINES:
+            # Биномиальная генерация определена только для бинарных метрик
+            if engine == 'binomial' and len(sampler.xk) != 2:
+                continue
+            for sample_size in grid['sample_sizes']:
+                for num_emulations in grid['num_emulations']:
+                    config = dict(
+                        BASE_CONFIG, engine=engine, num_emulations=num_emulations,
+                        sample_size=sample_size, sample_step=sample_size, max_sample_size=sample_size
+                    )
+                    case = {'distribution': kind, 'engine': engine,
+                            'sample_size': sample_size, 'num_emulations': num_emulations}
+                    yield case, (lambda config=config: run_experiment(sampler, config, progress='none')), \
+                        num_emulations, 'emulations'
+
+
+def distribution_cases(distributions, grid):
+    """
+    Замеры discrete_dist_creation на ряде размера data_size.
+    """
+    for kind, (series, _) in distributions.items():
+        yield {'distribution': kind}, (lambda series=series: discrete_dist_creation(series)), len(series), 'rows'
+
+
+def eda_cases(distributions, grid):
+    """
+    Замеры EDA.EDA (статистики и фигуры, плотность методом 'fft', как в приложении) на ряде размера data_size.
+    """
+    for kind, (series, _) in distributions.items():
+        yield {'distribution': kind}, (lambda series=series: EDA(series, pdf_method='fft')), len(series), 'rows'
+
+
+def means_cases(distributions, grid):
+    """
+    Замеры visualize_means_distribution по сетке размеров выборки и числа бутстрэпов.
+    """
+    for kind, (_, sampler) in distributions.items():
+        for sample_size in grid['sample_sizes']:
+            for num_emulations in grid['num_emulations']:
+                def build(sampler=sampler, sample_size=sample_size, num_emulations=num_emulations):
+                    return visualize_means_distribution(
+                        sampler, sample_size, BASE_CONFIG['mde_percent'], n_bootstraps=num_emulations,
+                        random_state=np.random.default_rng(BASE_CONFIG['seed'])
+                    )
+                case = {'distribution': kind, 'sample_size': sample_size, 'num_emulations': num_emulations}
+                yield case, build, num_emulations, 'emulations'
+
+
+# Словарь наборов замеров: имя -> генератор (параметры, функция, объем работы, единица)
+benchmark_suites = {
+    'engine': engine_cases,
+    'distribution': distribution_cases,
+    'eda': eda_cases,
+    'means': means_cases,
+}
+
+
+def prepare_distributions(kinds, data_size):
+    """
+    Синтетические ряды и построенные по ним сэмплеры для всех типов распределений.
+
+    Возвращает:
+    dict
+        kind -> (series, DiscreteSampler)
+    """
+    distributions = {}
+    for kind in kinds:
+        series = synthetic_series(kind, data_size)
+        rv, _, _ = discrete_dist_creation(series)
+        distributions[kind] = (series, DiscreteSampler.from_rv_discrete(rv))
+    return distributions
+
+
+def run_suite(grid_name='full', suites=None, repeats=3, on_result=None):
+    """
+    Выполняет выбранные наборы замеров.
+
+    Параметры:
+    grid_name : str
+        Сетка параметров из GRIDS ('full' или 'quick')
+    suites : list, optional
+        Имена наборов из benchmark_suites (по умолчанию все)
+    repeats : int
+        Число повторов для замера времени
+    on_result : callable, optional
+        Вызывается с каждой строкой результата (для вывода прогресса)
+
+    Возвращает:
+    pd.DataFrame
+        Колонки KEY_COLUMNS, support_size, seconds, throughput, throughput_unit, peak_memory_mb
+    """
+    if grid_name not in GRIDS:
+        raise ValueError(f"Неизвестная сетка: '{grid_name}'")
+    grid = GRIDS[grid_name]
+    suites = list(benchmark_suites) if suites is None else suites
+    for suite in suites:
+        if suite not in benchmark_suites:
+            raise ValueError(f"Неизвестный набор замеров: '{suite}'")
+
+    distributions = prepare_distributions(grid['distributions'], grid['data_size'])
+
+    rows = []
+    for suite in suites:
+        for case, function, items, unit in benchmark_suites[suite](distributions, grid):
+            row = dict.fromkeys(KEY_COLUMNS)
+            row.update(case, benchmark=suite, support_size=len(distributions[case['distribution']][1].xk))
+            row.update(measure(function, items, unit, repeats))
+            rows.append(row)
+            if on_result:
+                on_result(row)
+
+    results = pd.DataFrame(rows, columns=KEY_COLUMNS + ['support_size', 'seconds', 'throughput',
+                                                        'throughput_unit', 'peak_memory_mb'])
+    # Параметры сетки есть не у всех наборов: целые с пропусками
+    return results.astype({'sample_size': 'Int64', 'num_emulations': 'Int64'})
+
+
+def _git_commit():
+    """
+    Короткий хеш текущего коммита (None вне git-репозитория).
+    """
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        completed = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                   cwd=project_root, capture_output=True, text=True)
+    except OSError:
+        return None
+    return completed.stdout.strip() or None
+
+
+def save_results(results, results_dir=RESULTS_DIR):
+    """
+    Записывает результаты запуска в CSV вместе с окружением (коммит, время, версии).
+
+    Возвращает:
+    str
+        Путь к записанному файлу
+    """
+    commit = _git_commit()
+    timestamp = time.strftime('%Y%m%d-%H%M%S')
+
+    results = results.assign(
+        commit=commit,
+        timestamp=timestamp,
+        python=platform.python_version(),
+        numpy=np.__version__,
+        machine=platform.machine()
+    )
+
+    os.makedirs(results_dir, exist_ok=True)
+    path = os.path.join(results_dir, f"{timestamp}_{commit or 'nogit'}.csv")
+    results.to_csv(path, index=False)
+    return path
+
+
+def _case_keys(results):
+    """
+    Строковый ключ замера, не зависящий от типов колонок после чтения из CSV.
+    """
+    keys = results[KEY_COLUMNS].copy()
+    for column in ('benchmark', 'distribution', 'engine'):
+        keys[column] = keys[column].fillna('').astype(str)
+    for column in ('sample_size', 'num_emulations'):
+        keys[column] = pd.to_numeric(keys[column]).map(lambda value: '' if pd.isna(value) else str(int(value)))
+    return keys.agg('|'.join, axis=1)
+
+
+def compare_results(baseline, current, threshold=REGRESSION_THRESHOLD):
+    """
+    Сопоставляет два запуска по KEY_COLUMNS.
+
+    Возвращает:
+    pd.DataFrame
+        Ключевые колонки, время и память обоих запусков, отношения current / baseline
+        и флаг regression (замедление больше threshold)
+    """
+    baseline = baseline.assign(_key=_case_keys(baseline))
+    current = current.assign(_key=_case_keys(current))
+
+    merged = current[KEY_COLUMNS + ['_key', 'seconds', 'peak_memory_mb']].merge(
+        baseline[['_key', 'seconds', 'peak_memory_mb']], on='_key', suffixes=('', '_baseline')
+    ).drop(columns='_key')
+
+    merged['time_ratio'] = merged['seconds'] / merged['seconds_baseline']
+    merged['memory_ratio'] = merged['peak_memory_mb'] / merged['peak_memory_mb_baseline']
+    merged['regression'] = merged['time_ratio'] > 1 + threshold
+    return merged
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m Benchmarks.performance_suite',
+        description='Бенчмарки движка, построения распределения, EDA и бутстрэпа средних'
+    )
+    parser.add_argument('--quick', action='store_true', help='Уменьшенная сетка параметров')
+    parser.add_argument('--only', nargs='+', choices=list(benchmark_suites), help='Запустить только эти наборы')
+    parser.add_argument('--repeats', type=int, default=3, help='Число повторов замера времени')
+    parser.add_argument('--results-dir', default=RESULTS_DIR, help='Каталог для CSV с результатами')
+    parser.add_argument('--compare', help='CSV предыдущего запуска для сравнения')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help='Допустимое относительное замедление при сравнении')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    def print_row(row):
+        parameters = ', '.join(f"{column}={row[column]}" for column in KEY_COLUMNS[1:] if row[column] is not None)
+        print(f"{row['benchmark']:>12}  {parameters}: {row['seconds']:.3f} с, "
+              f"{row['throughput']:,.0f} {row['throughput_unit']}/с, {row['peak_memory_mb']:.1f} МБ",
+              file=sys.stderr)
+
+    results = run_suite('quick' if args.quick else 'full', args.only, args.repeats, on_result=print_row)
+    print(results.to_string(index=False))
+    print(f"Результаты записаны в {save_results(results, args.results_dir)}", file=sys.stderr)
+
+    if args.compare:
+        comparison = compare_results(pd.read_csv(args.compare), results, args.threshold)
+        print(comparison.to_string(index=False))
+        if comparison['regression'].any():
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
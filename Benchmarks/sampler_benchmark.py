@@ -0,0 +1,84 @@
+"""
+Микробенчмарк сэмплеров дискретного распределения
+=================================================
+
+Сравнивает scipy.stats.rv_discrete.rvs с DiscreteSampler (методы 'alias'
+и 'searchsorted') на синтетических распределениях разного размера носителя.
+
+Запуск из корня проекта:
+    python -m Benchmarks.sampler_benchmark
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from ExperimentsCore.experiments_core import discrete_dist_creation
+from ExperimentsCore.discrete_sampler import DiscreteSampler
+
+
+def synthetic_series(kind, size=200_000, seed=0):
+    """
+    Синтетический ряд: 'binary' (конверсия), 'poisson' (счетчик) или 'revenue' (тяжелый хвост).
+    """
+    rng = np.random.default_rng(seed)
+    if kind == 'binary':
+        data = rng.binomial(1, 0.1, size)
+    elif kind == 'poisson':
+        data = rng.poisson(3, size)
+    elif kind == 'revenue':
+        data = rng.lognormal(3, 1.5, size)
+    else:
+        raise ValueError(f"Неизвестный тип ряда: '{kind}'")
+    return pd.Series(data.astype(float))
+
+
+def best_time(function, repeats=5):
+    """
+    Минимальное время выполнения функции из нескольких повторов.
+    """
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run_benchmark(kinds=('binary', 'poisson', 'revenue'), shape=(100, 10_000), repeats=5):
+    """
+    Измеряет время генерации блока формы shape каждым сэмплером.
+
+    Возвращает:
+    pd.DataFrame
+        Колонки: distribution, support_size, sampler, seconds, values_per_second, speedup
+    """
+    rows = []
+    for kind in kinds:
+        rv, df_dist, _ = discrete_dist_creation(synthetic_series(kind))
+        samplers = {
+            'rv_discrete': rv,
+            'alias': DiscreteSampler.from_rv_discrete(rv, 'alias'),
+            'searchsorted': DiscreteSampler.from_rv_discrete(rv, 'searchsorted'),
+        }
+        generator = np.random.default_rng(1)
+
+        baseline = None
+        for name, sampler in samplers.items():
+            seconds = best_time(lambda: sampler.rvs(size=shape, random_state=generator), repeats)
+            baseline = seconds if baseline is None else baseline
+            rows.append({
+                'distribution': kind,
+                'support_size': len(df_dist),
+                'sampler': name,
+                'seconds': seconds,
+                'values_per_second': np.prod(shape) / seconds,
+                'speedup': baseline / seconds,
+            })
+
+    return pd.DataFrame(rows)
+
+
+if __name__ == '__main__':
+    print(run_benchmark().to_string(index=False))
@@ -0,0 +1,94 @@
+"""
+Сравнение вычислительных бэкендов pandas и Polars
+================================================
+
+Замеряет время summary_statistics (базовые статистики + квантили) и
+discrete_dist_creation на синтетических рядах и сверяет результаты бэкендов:
+статистики - по максимальному относительному расхождению, носитель
+распределения - на точное совпадение xk и pk.
+
+Запуск из корня проекта (требуется установленный polars):
+    python -m Benchmarks.statistics_backend_benchmark
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from Benchmarks.sampler_benchmark import best_time, synthetic_series
+from ExperimentsCore.experiments_core import discrete_dist_creation
+from Statistics.statistics import get_statistics_backend, summary_statistics
+
+
+def max_relative_difference(left, right):
+    """
+    Максимальное относительное расхождение значений двух словарей статистик.
+    """
+    differences = []
+    for key in left:
+        a, b = float(left[key]), float(right[key])
+        if np.isnan(a) and np.isnan(b):
+            continue
+        differences.append(abs(a - b) / max(abs(a), abs(b), 1e-300))
+    return max(differences) if differences else 0.0
+
+
+def compare_backends(series, repeats=3):
+    """
+    Сравнивает pandas и Polars на одном ряду.
+
+    Возвращает:
+    dict
+        Время каждого бэкенда и показатели совпадения результатов
+    """
+    pandas_base, pandas_quantiles = summary_statistics(series, 'pandas')
+    polars_base, polars_quantiles = summary_statistics(series, 'polars')
+    _, pandas_dist, _ = discrete_dist_creation(series, backend='pandas')
+    _, polars_dist, _ = discrete_dist_creation(series, backend='polars')
+
+    support_identical = (
+        len(pandas_dist) == len(polars_dist)
+        and np.array_equal(pandas_dist['value'].values, polars_dist['value'].values)
+        and np.array_equal(pandas_dist['probability'].values, polars_dist['probability'].values)
+    )
+
+    return {
+        'stats_pandas_seconds': best_time(lambda: summary_statistics(series, 'pandas'), repeats),
+        'stats_polars_seconds': best_time(lambda: summary_statistics(series, 'polars'), repeats),
+        'dist_pandas_seconds': best_time(lambda: discrete_dist_creation(series, backend='pandas'), repeats),
+        'dist_polars_seconds': best_time(lambda: discrete_dist_creation(series, backend='polars'), repeats),
+        'stats_max_relative_difference': max(
+            max_relative_difference(pandas_base, polars_base),
+            max_relative_difference(pandas_quantiles, polars_quantiles)
+        ),
+        'support_identical': support_identical,
+    }
+
+
+def run_benchmark(kinds=('binary', 'poisson', 'revenue'), sizes=(100_000, 1_000_000), repeats=3):
+    """
+    Сравнивает бэкенды на рядах разного типа и размера.
+
+    Возвращает:
+    pd.DataFrame
+        Колонки: distribution, size, время каждого бэкенда, ускорения и показатели совпадения
+    """
+    rows = []
+    for kind in kinds:
+        for size in sizes:
+            row = {'distribution': kind, 'size': size}
+            row.update(compare_backends(synthetic_series(kind, size), repeats))
+            row['stats_speedup'] = row['stats_pandas_seconds'] / row['stats_polars_seconds']
+            row['dist_speedup'] = row['dist_pandas_seconds'] / row['dist_polars_seconds']
+            rows.append(row)
+    return pd.DataFrame(rows)
+
+
+if __name__ == '__main__':
+    try:
+        get_statistics_backend('polars')
+    except ImportError as e:
+        print(e)
+        sys.exit(1)
+    print(run_benchmark().to_string(index=False))
@@ -1,30 +1,54 @@
 # Модуль, принимающий конфигурацию загрузки данных и возвращающий датафрейм
-import digger as dg
+# Клиент digger импортируется только при загрузке из Digger
+import importlib.util
+import numpy as np
 import pandas as pd
-from IPython.display import display
 import time
 import io
 
-def load_data_from_digger(config):
+# Размер чанка по умолчанию при потоковом чтении CSV (строк)
+CSV_CHUNKSIZE = 1_000_000
+
+# Доля уникальных значений, ниже которой строковая колонка переводится в category
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+def load_data_from_digger(config, snapshot_cache=None):
     """
     Загружает данные из Digger в датафрейм
-    1. Авторизация в Digger происходит через библиотеку digger
-    2. Запрос данных происходит через библиотеку digger
+    1. Если передан кеш снимков и в нем есть свежий снимок запроса - данные читаются с диска
+    2. Иначе авторизация в Digger происходит через библиотеку digger
+    3. Запрос данных происходит через библиотеку digger, результат сохраняется в кеш снимков
+    Модуль digger импортируется при вызове, поэтому в тестах его можно подменить
+    заглушкой через sys.modules['digger'].
     Входные параметры:
         config:
             auth_login: логин для авторизации в Digger
             auth_pass: пароль для авторизации в Digger
             query_id: id запроса в Digger
+            refresh: загрузить заново, игнорируя снимок (опционально)
+        snapshot_cache: DiggerSnapshotCache (опционально)
     Возвращает:
         dict: 
             df: датафрейм с данными из Digger,
             columns: список колонок в датафрейме
     """
-    # Авторизация в Digger
-    dg.set_auth(config['auth_login'], config['auth_pass'])
+    query_id = int(config['query_id'])
+
+    df = None
+    if snapshot_cache is not None and not config.get('refresh', False):
+        df = snapshot_cache.get(query_id)
 
-    # Запрос данных из Digger
-    df = dg.get_df(int(config['query_id']))
+    if df is None:
+        import digger as dg
+        
+        # Авторизация в Digger
+        dg.set_auth(config['auth_login'], config['auth_pass'])
+
+        # Запрос данных из Digger
+        df = dg.get_df(query_id)
+
+        if snapshot_cache is not None:
+            snapshot_cache.put(query_id, df)
 
     # Показываем информацию о датафрейме
     df.info()
@@ -34,23 +58,135 @@ def load_data_from_digger(config):
 
     return {'df': df, 'columns': columns}
 
+def _csv_source(config):
+    """
+    Возвращает источник CSV для pandas: путь к файлу (file_path) или
+    содержимое загруженного файла (file_content) в виде потока.
+    """
+    if config.get('file_path'):
+        return config['file_path']
+    return io.BytesIO(config['file_content'])
+
+
+def _resolve_csv_engine(engine):
+    """
+    Возвращает движок чтения CSV: 'pyarrow' используется только если он установлен,
+    иначе - стандартный движок 'c'.
+    """
+    if engine == 'pyarrow' and importlib.util.find_spec('pyarrow') is None:
+        return 'c'
+    return engine
+
+
+def read_csv_columns(config):
+    """
+    Читает только заголовок CSV и возвращает список колонок
+    Входные параметры:
+        config: file_content или file_path
+    Возвращает:
+        list: названия колонок
+    """
+    return pd.read_csv(_csv_source(config), nrows=0).columns.tolist()
+
+
+def downcast_dtypes(df):
+    """
+    Уменьшает типы колонок без потери значений:
+    целые - до минимального целого типа, вещественные - до float32, если значения
+    представимы точно, строковые с небольшим числом уникальных значений - до category
+    Входные параметры:
+        df: датафрейм
+    Возвращает:
+        pd.DataFrame: датафрейм с уменьшенными типами
+    """
+    for column in df.columns:
+        series = df[column]
+        if pd.api.types.is_integer_dtype(series):
+            df[column] = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_float_dtype(series):
+            downcasted = series.astype(np.float32)
+            if np.array_equal(downcasted.values.astype(np.float64), series.values, equal_nan=True):
+                df[column] = downcasted
+        elif pd.api.types.is_string_dtype(series) and len(series) > 0:
+            if series.nunique(dropna=True) / len(series) < CATEGORY_MAX_UNIQUE_RATIO:
+                df[column] = series.astype('category')
+    return df
+
+
 def load_data_from_csv(config):
     """
     Загружает данные из CSV в датафрейм
+    Без дополнительных параметров читает все колонки стандартным pd.read_csv.
+    С usecols сначала читается заголовок, затем только нужные колонки -
+    для больших выгрузок, из которых калькулятор использует одну числовую колонку.
+    Функция возвращает весь датафрейм, поэтому память ограничена его размером;
+    для файлов больше памяти - iter_csv_chunks и потоковое построение распределения.
     Входные параметры:
         config:
-            file_content: содержимое CSV файла
+            file_content: содержимое CSV файла (или file_path: путь к файлу)
+            usecols: список колонок для чтения (опционально)
+            engine: движок pandas ('c' по умолчанию, 'pyarrow' - если установлен)
+            downcast: уменьшать типы колонок без потери значений (по умолчанию False)
     Возвращает:
         dict: 
             df: датафрейм с данными из CSV,
-            columns: список колонок в датафрейме
+            columns: список колонок в датафрейме (все колонки файла)
     """
-    # Читаем CSV из содержимого файла
-    df = pd.read_csv(io.BytesIO(config['file_content']))
-    
-    # Список колонок в датафрейме
-    columns = df.columns.tolist()
-    
+    usecols = config.get('usecols')
+    engine = _resolve_csv_engine(config.get('engine', 'c'))
+    downcast = config.get('downcast', False)
+
+    if usecols is None and engine == 'c' and not downcast:
+        # Читаем CSV из содержимого файла
+        df = pd.read_csv(_csv_source(config))
+        return {'df': df, 'columns': df.columns.tolist()}
+
+    # Список колонок в файле по заголовку
+    columns = read_csv_columns(config)
+    if usecols is not None:
+        missing = [column for column in usecols if column not in columns]
+        if missing:
+            raise ValueError(f"Колонки не найдены в CSV: {missing}")
+
+    df = pd.read_csv(_csv_source(config), usecols=usecols, engine=engine)
+    if downcast:
+        df = downcast_dtypes(df)
+
+    if usecols is not None:
+        df = df[usecols]
+
     return {'df': df, 'columns': columns}
 
 
+def iter_csv_chunks(config):
+    """
+    Читает CSV чанками (для потокового построения распределения)
+    Входные параметры:
+        config:
+            file_content: содержимое CSV файла (или file_path: путь к файлу)
+            usecols: список колонок для чтения (опционально)
+            chunksize: размер чанка в строках (по умолчанию CSV_CHUNKSIZE)
+    Возвращает:
+        iterator: датафреймы по chunksize строк
+    """
+    chunksize = config.get('chunksize') or CSV_CHUNKSIZE
+    yield from pd.read_csv(_csv_source(config), usecols=config.get('usecols'), chunksize=chunksize)
+
+
+def iter_parquet_chunks(config):
+    """
+    Читает Parquet батчами (требует pyarrow)
+    Входные параметры:
+        config:
+            file_path: путь к файлу
+            usecols: список колонок для чтения (опционально)
+            chunksize: размер батча в строках (по умолчанию CSV_CHUNKSIZE)
+    Возвращает:
+        iterator: датафреймы по chunksize строк
+    """
+    import pyarrow.parquet as pq
+    
+    parquet_file = pq.ParquetFile(config['file_path'])
+    chunksize = config.get('chunksize') or CSV_CHUNKSIZE
+    for batch in parquet_file.iter_batches(batch_size=chunksize, columns=config.get('usecols')):
+        yield batch.to_pandas()
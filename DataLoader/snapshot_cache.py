@@ -0,0 +1,140 @@
+"""
+Локальный кеш снимков результатов запросов Digger
+=================================================
+
+load_data_from_digger на каждое нажатие заново авторизуется и скачивает
+весь результат запроса. Кеш снимков сохраняет датафрейм по query_id на
+локальный диск и при повторной загрузке читает его без обращения к сети.
+
+Форматы хранения (snapshot_formats):
+- 'arrow': несжатый файл Arrow IPC (Feather v2), при чтении отображается
+  в память (memory_map), требует pyarrow
+- 'pickle': pandas pickle, запасной вариант без дополнительных зависимостей
+
+По умолчанию используется 'arrow', если установлен pyarrow, иначе 'pickle'.
+Снимок старше ttl_seconds (по времени изменения файла) считается устаревшим.
+
+Пример использования:
+    snapshot_cache = DiggerSnapshotCache('~/.cache/mde_calculator/digger_snapshots', ttl_seconds=3600)
+    data = load_data_from_digger(config, snapshot_cache=snapshot_cache)
+"""
+
+import importlib.util
+import os
+import time
+
+import pandas as pd
+
+
+def _write_arrow(df, path):
+    import pyarrow.feather as feather
+    # Без сжатия: только такой файл можно отобразить в память без распаковки
+    feather.write_feather(df, path, compression='uncompressed')
+
+
+def _read_arrow(path):
+    import pyarrow.feather as feather
+    return feather.read_table(path, memory_map=True).to_pandas(split_blocks=True)
+
+
+def _write_pickle(df, path):
+    df.to_pickle(path)
+
+
+def _read_pickle(path):
+    return pd.read_pickle(path)
+
+
+# Словарь форматов снимков: имя -> (расширение файла, запись, чтение)
+snapshot_formats = {
+    'arrow': ('.arrow', _write_arrow, _read_arrow),
+    'pickle': ('.pkl', _write_pickle, _read_pickle),
+}
+
+
+def default_snapshot_format():
+    """
+    Возвращает 'arrow', если установлен pyarrow, иначе 'pickle'.
+    """
+    return 'arrow' if importlib.util.find_spec('pyarrow') is not None else 'pickle'
+
+
+class DiggerSnapshotCache:
+    """
+    Хранилище снимков результатов запросов Digger на локальном диске.
+
+    Параметры:
+    cache_dir : str
+        Папка для снимков
+    ttl_seconds : float, optional
+        Время жизни снимка в секундах (None - без ограничения)
+    snapshot_format : str, optional
+        Формат из snapshot_formats (по умолчанию - default_snapshot_format())
+    """
+
+    def __init__(self, cache_dir, ttl_seconds=None, snapshot_format=None):
+        snapshot_format = snapshot_format or default_snapshot_format()
+        if snapshot_format not in snapshot_formats:
+            raise ValueError(f"Неизвестный формат снимка: '{snapshot_format}'")
+
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.ttl_seconds = ttl_seconds
+        self.snapshot_format = snapshot_format
+        self._extension, self._write, self._read = snapshot_formats[snapshot_format]
+
+    @staticmethod
+    def make_key(query_id):
+        """
+        Формирует ключ снимка по идентификатору запроса.
+        """
+        return f"query_{int(query_id)}"
+
+    def _path(self, query_id):
+        return os.path.join(self.cache_dir, self.make_key(query_id) + self._extension)
+
+    def is_fresh(self, query_id):
+        """
+        Проверяет, что снимок существует и не старше ttl_seconds.
+        """
+        path = self._path(query_id)
+        if not os.path.exists(path):
+            return False
+        if self.ttl_seconds is None:
+            return True
+        return time.time() - os.path.getmtime(path) <= self.ttl_seconds
+
+    def get(self, query_id):
+        """
+        Возвращает датафрейм из свежего снимка или None.
+        """
+        if not self.is_fresh(query_id):
+            return None
+        return self._read(self._path(query_id))
+
+    def put(self, query_id, df):
+        """
+        Сохраняет датафрейм как снимок запроса.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Пишем во временный файл и переименовываем, чтобы не оставить битый снимок
+        temporary_path = self._path(query_id) + '.tmp'
+        self._write(df, temporary_path)
+        os.replace(temporary_path, self._path(query_id))
+
+    def invalidate(self, query_id):
+        """
+        Удаляет снимок запроса.
+        """
+        path = self._path(query_id)
+        if os.path.exists(path):
+            os.remove(path)
+
+    def clear(self):
+        """
+        Удаляет все снимки текущего формата.
+        """
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            if name.startswith('query_') and name.endswith(self._extension):
+                os.remove(os.path.join(self.cache_dir, name))
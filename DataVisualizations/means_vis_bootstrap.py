@@ -1,48 +1,102 @@
 import numpy as np
-import plotly.graph_objects as go
-from Statistics.mde_add_methods import get_effect_adder
+from Statistics.mde_add_methods import get_moment_effect_adder
+from ExperimentsCore.experiments_engine import iter_sample_moments, MAX_BLOCK_ELEMENTS
+
+# Количество столбцов гистограммы средних (общие границы для обеих групп)
+HISTOGRAM_BINS = 60
+
+def visualize_means_distribution(rv_discrete, sample_size, mde_percent, statistic='mean', n_bootstraps=5000,
+                                 max_block_elements=MAX_BLOCK_ELEMENTS, clt_overlay=False, random_state=None):
+    """
+    Строит распределения выборочных средних контрольной и экспериментальной групп.
+
+    Выборки генерируются векторизованными блоками (или частотами над носителем,
+    если это дешевле) под бюджет памяти max_block_elements; эффект применяется
+    к моментам так же, как в движке эмуляций. Гистограммы агрегируются в numpy,
+    поэтому в фигуру попадают только столбцы, а не n_bootstraps точек.
+
+    Args:
+        rv_discrete: Дискретное распределение (rv_discrete или DiscreteSampler)
+        sample_size (int): Размер выборки
+        mde_percent (float): Процентное значение MDE
+        statistic (str): Статистика для добавления эффекта
+        n_bootstraps (int): Количество бутстрэп-выборок
+        max_block_elements (int): Максимальное число элементов в одном блоке выборок
+        clt_overlay (bool): Добавить нормальное приближение по ЦПТ: N(μ, σ²/n) и N(μ·(1 + MDE), σ²/n)
+        random_state (numpy.random.Generator, optional): Источник случайности
+
+    Returns:
+        go.Figure: Две гистограммы средних на одном графике
+    """
+    import plotly.graph_objects as go
+
+    moment_effect_adder = get_moment_effect_adder(statistic)
 
-def visualize_means_distribution(rv_discrete, sample_size, mde_percent, statistic='mean', n_bootstraps=5000):
-    effect_adder = get_effect_adder(statistic)
-    
     means_control = []
     means_experiment = []
-    
-    for _ in range(n_bootstraps):
-        # Генерация контрольной выборки
-        control_sample = rv_discrete.rvs(size=sample_size)
-        
-        # Генерация экспериментальной выборки с добавлением эффекта
-        experiment_sample = effect_adder(control_sample, mde_percent)
-        
-        # Расчет средних
-        means_control.append(np.mean(control_sample))
-        means_experiment.append(np.mean(experiment_sample))
-    
+
+    for mean_c, var_c in iter_sample_moments(rv_discrete, sample_size, n_bootstraps, max_block_elements, random_state):
+        # Добавление эффекта к моментам контрольной выборки
+        mean_e, _ = moment_effect_adder(mean_c, var_c, mde_percent)
+
+        means_control.append(mean_c)
+        means_experiment.append(mean_e)
+
+    means_control = np.concatenate(means_control)
+    means_experiment = np.concatenate(means_experiment)
+
+    # Общие границы столбцов для обеих групп
+    edges = np.histogram_bin_edges(np.concatenate([means_control, means_experiment]), bins=HISTOGRAM_BINS)
+    centers = (edges[:-1] + edges[1:]) / 2
+    bin_width = edges[1] - edges[0]
+    counts_control, _ = np.histogram(means_control, bins=edges)
+    counts_experiment, _ = np.histogram(means_experiment, bins=edges)
+
     # Создание визуализации - двух гистограмм на одном графике
     fig = go.Figure()
-    
-    fig.add_trace(go.Histogram(
-        x=means_control,
+
+    fig.add_trace(go.Bar(
+        x=centers,
+        y=counts_control,
+        width=bin_width,
         opacity=0.7,
         name='Контрольная группа',
-        marker=dict(color='blue'),
-        nbinsx=30
+        marker=dict(color='blue')
     ))
-    
-    fig.add_trace(go.Histogram(
-        x=means_experiment,
+
+    fig.add_trace(go.Bar(
+        x=centers,
+        y=counts_experiment,
+        width=bin_width,
         opacity=0.7,
         name='Экспериментальная группа (с MDE)',
-        marker=dict(color='red'),
-        nbinsx=30
+        marker=dict(color='red')
     ))
-    
+
+    if clt_overlay:
+        # Нормальное приближение, пересчитанное в ожидаемые частоты столбцов
+        mean = rv_discrete.mean()
+        standard_error = rv_discrete.std() / np.sqrt(sample_size)
+        x = np.linspace(edges[0], edges[-1], 200)
+        for center, color, name in (
+            (mean, 'blue', 'ЦПТ: контроль'),
+            (mean * (1 + mde_percent / 100), 'red', 'ЦПТ: эксперимент')
+        ):
+            density = np.exp(-0.5 * ((x - center) / standard_error) ** 2) / (standard_error * np.sqrt(2 * np.pi))
+            fig.add_trace(go.Scatter(
+                x=x,
+                y=density * n_bootstraps * bin_width,
+                mode='lines',
+                name=name,
+                line=dict(color=color, dash='dash')
+            ))
+
     fig.update_layout(
         title=f'Распределение средних (размер выборки: {sample_size}, MDE: {mde_percent}%)',
         xaxis_title='Среднее значение',
         yaxis_title='Частота',
-        barmode='overlay'
+        barmode='overlay',
+        bargap=0
     )
-    
-    return fig
\ No newline at end of file
+
+    return fig
@@ -1,10 +1,12 @@
-import plotly.express as px
-import plotly.graph_objects as go
+# plotly импортируется внутри функций построения графиков: модуль подключается
+# вместе с EDA и не должен замедлять запуск, пока графики не нужны
 import numpy as np
 import pandas as pd
 
 
 def power_analysis_plot(results_df, target_power=None):
+    import plotly.express as px
+    
     fig = px.line(
         results_df, 
         x='sample_size', 
@@ -25,51 +27,101 @@ def power_analysis_plot(results_df, target_power=None):
     return fig
 
 
-def histogram(series, sample_size=10000):
+def shared_sample(series, sample_size=10000, random_state=42):
+    """
+    Общая подвыборка для графиков EDA: одна на гистограмму, scatter plot и boxplot.
+    
+    Args:
+        series (pd.Series): Входной числовой ряд
+        sample_size (int): Размер подвыборки (с возвращением)
+        random_state (int): Seed сэмплирования
+        
+    Returns:
+        numpy.ndarray: Значения подвыборки без пропусков
+    """
+    data = series.dropna()
+    if len(data) == 0:
+        return np.array([], dtype=float)
+    return data.sample(n=sample_size, replace=True, random_state=random_state).to_numpy(dtype=float)
+
+
+def histogram(series, sample_size=10000, sample=None, bins=100):
+    """
+    Гистограмма по подвыборке: столбцы считаются в numpy, в фигуру попадают только частоты.
+    
+    Args:
+        series (pd.Series): Входной числовой ряд
+        sample_size (int): Размер подвыборки, если sample не передан
+        sample (numpy.ndarray, optional): Готовая подвыборка из shared_sample
+        bins (int): Количество столбцов
+        
+    Returns:
+        go.Figure: Гистограмма
+    """
+    import plotly.graph_objects as go
+    
     # Сэмплируем объекты
-    sample = series.sample(n=sample_size, replace=True, random_state=42)
+    if sample is None:
+        sample = shared_sample(series, sample_size)
+    
+    counts, edges = np.histogram(sample, bins=bins)
     
     fig = go.Figure()
     
-    fig.add_trace(go.Histogram(
-        x=sample,
-        name='Distribution Histogram',
-        nbinsx=100
+    fig.add_trace(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        name='Distribution Histogram'
     ))
     
     fig.update_layout(
-        title=f'Histogram (sample {sample_size})',
+        title=f'Histogram (sample {len(sample)})',
         xaxis_title='Values',
         yaxis_title='Count',
         showlegend=True,
-        template='plotly_white'
+        template='plotly_white',
+        bargap=0
     )
     
     return fig
 
 
-def cdf(pdf_df):
+def cdf(pdf_df=None, df_dist=None):
     """
-    Создает график кумулятивной функции распределения на основе PDF.
+    Создает график кумулятивной функции распределения на основе PDF
+    или точную эмпирическую CDF по дискретному распределению.
     
     Args:
         pdf_df (pd.DataFrame): DataFrame с колонками 'x' и 'density' из функции pdf_creation
+        df_dist (pd.DataFrame, optional): DataFrame с колонками 'value' и 'cumulative_probability'
+            из discrete_dist_creation; если передан, CDF строится по нему без интегрирования PDF
         
     Returns:
         go.Figure: График CDF
     """
-    # Вычисляем CDF через интеграл от PDF
-    cdf_values = np.cumsum(pdf_df['density']) * (pdf_df['x'].iloc[1] - pdf_df['x'].iloc[0])
-    cdf_values = cdf_values / cdf_values.max()  # Нормализуем
+    import plotly.graph_objects as go
+    
+    if df_dist is not None:
+        # Эмпирическая CDF - ступенчатая функция по носителю распределения
+        x_values = df_dist['value']
+        cdf_values = df_dist['cumulative_probability']
+        line_shape = 'hv'
+    else:
+        # Вычисляем CDF через интеграл от PDF
+        x_values = pdf_df['x']
+        cdf_values = np.cumsum(pdf_df['density']) * (pdf_df['x'].iloc[1] - pdf_df['x'].iloc[0])
+        cdf_values = cdf_values / cdf_values.max()  # Нормализуем
+        line_shape = 'linear'
     
     fig = go.Figure()
     
     fig.add_trace(go.Scatter(
-        x=pdf_df['x'],
+        x=x_values,
         y=cdf_values,
         mode='lines',
         name='CDF',
-        line=dict(width=2)
+        line=dict(width=2, shape=line_shape)
     ))
     
     fig.update_layout(
@@ -83,13 +135,27 @@ def cdf(pdf_df):
     return fig
 
 
-def scatter_plot(series, sample_size=10000):
+def scatter_plot(series, sample_size=10000, sample=None):
+    """
+    Scatter plot подвыборки (WebGL).
+    
+    Args:
+        series (pd.Series): Входной числовой ряд
+        sample_size (int): Размер подвыборки, если sample не передан
+        sample (numpy.ndarray, optional): Готовая подвыборка из shared_sample
+        
+    Returns:
+        go.Figure: Scatter plot
+    """
+    import plotly.graph_objects as go
+    
     # Сэмплируем объекты
-    sample = series.sample(n=sample_size, replace=True, random_state=42)
+    if sample is None:
+        sample = shared_sample(series, sample_size)
     
     fig = go.Figure()
     
-    fig.add_trace(go.Scatter(
+    fig.add_trace(go.Scattergl(
         x=np.arange(len(sample)),
         y=sample,
         mode='markers',
@@ -101,7 +167,7 @@ def scatter_plot(series, sample_size=10000):
     ))
     
     fig.update_layout(
-        title=f'Scatterplot (sample {sample_size})',
+        title=f'Scatterplot (sample {len(sample)})',
         xaxis_title='Index',
         yaxis_title='Values',
         showlegend=True,
@@ -111,27 +177,80 @@ def scatter_plot(series, sample_size=10000):
     return fig
 
 
-def boxplot(series, sample_size=10000):
+def box_statistics(values):
+    """
+    Статистики ящика с усами (как у plotly): квартили с линейной интерполяцией,
+    усы - крайние значения в пределах 1.5 IQR от квартилей.
+    
+    Args:
+        values (numpy.ndarray): Значения без пропусков
+        
+    Returns:
+        dict: q1, median, q3, lowerfence, upperfence, mean и массив outliers
+    """
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)]
+    lowerfence, upperfence = inside.min(), inside.max()
+    
+    return {
+        'q1': q1,
+        'median': median,
+        'q3': q3,
+        'lowerfence': lowerfence,
+        'upperfence': upperfence,
+        'mean': values.mean(),
+        'outliers': values[(values < lowerfence) | (values > upperfence)]
+    }
+
+
+def boxplot(series, sample_size=10000, sample=None):
+    """
+    Boxplot по статистикам подвыборки: в фигуру попадают квартили, усы и выбросы.
+    
+    Args:
+        series (pd.Series): Входной числовой ряд
+        sample_size (int): Размер подвыборки, если sample не передан
+        sample (numpy.ndarray, optional): Готовая подвыборка из shared_sample
+        
+    Returns:
+        go.Figure: Boxplot
+    """
+    import plotly.graph_objects as go
+    
     # Сэмплируем объекты
-    sample = series.sample(n=sample_size, replace=True, random_state=42)
+    if sample is None:
+        sample = shared_sample(series, sample_size)
+    
+    box = box_statistics(sample)
     
     fig = go.Figure()
     
     fig.add_trace(go.Box(
-        y=sample,
-        name='Boxplot',
-        boxpoints='outliers'
+        x=['Boxplot'],
+        q1=[box['q1']],
+        median=[box['median']],
+        q3=[box['q3']],
+        lowerfence=[box['lowerfence']],
+        upperfence=[box['upperfence']],
+        mean=[box['mean']],
+        name='Boxplot'
+    ))
+    
+    # Выбросы отдельным слоем: у ящика, заданного статистиками, точек нет
+    fig.add_trace(go.Scattergl(
+        x=np.full(len(box['outliers']), 'Boxplot'),
+        y=box['outliers'],
+        mode='markers',
+        name='Outliers',
+        marker=dict(size=4, opacity=0.6)
     ))
     
     fig.update_layout(
-        title=f'Boxplot (sample {sample_size})',
+        title=f'Boxplot (sample {len(sample)})',
         yaxis_title='Values',
         showlegend=True,
         template='plotly_white'
     )
     
     return fig
-
-
-
-
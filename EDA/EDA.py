@@ -11,6 +11,9 @@
 
 # На вход модуль получает:
     # pd.Series (df['column_name'])
+    # backend - вычислительный бэкенд статистик ('pandas' или 'polars')
+    # pdf_method - метод оценки плотности для CDF ('gaussian_kde' по умолчанию или более быстрый 'fft')
+    # df_dist - дискретное распределение для точной эмпирической CDF (опционально)
 
 # На выходе:
     # {'statistics': 
@@ -26,7 +29,6 @@
 
 import Statistics.statistics as stats
 import DataVisualizations.visualizations as vis
-from plotly.subplots import make_subplots
 
 
 def create_multiplot(figures_dict):
@@ -47,20 +49,6 @@ def create_multiplot(figures_dict):
             template='plotly_white'
         )
     
-    # Обновляем названия графиков на английском
-    figures_dict['histogram'].update_layout(
-        title=f'Histogram (sample {figures_dict["histogram"].data[0].x.shape[0]})'
-    )
-    figures_dict['cdf'].update_layout(
-        title='CDF'
-    )
-    figures_dict['scatter_plot'].update_layout(
-        title=f'Scatterplot (sample {figures_dict["scatter_plot"].data[0].y.shape[0]})'
-    )
-    figures_dict['boxplot'].update_layout(
-        title=f'Boxplot (sample {figures_dict["boxplot"].data[0].y.shape[0]})'
-    )
-    
     # Возвращаем список графиков для вертикального отображения
     return [
         figures_dict['histogram'],
@@ -70,10 +58,9 @@ def create_multiplot(figures_dict):
     ]
 
 
-def eda_stats(series):
+def eda_stats(series, backend='pandas'):
     # Получаем результаты статистических функций
-    base_stats_result = stats.base_statistics(series)
-    quantiles_result = stats.quantiles(series)
+    base_stats_result, quantiles_result = stats.summary_statistics(series, backend)
 
     return {
         'base_statistics': base_stats_result, 
@@ -81,12 +68,15 @@ def eda_stats(series):
     }
 
 
-def eda_visualizations(series, pdf_df):
+def eda_visualizations(series, pdf_df, df_dist=None, sample_size=10000):
+    # Одна общая подвыборка для гистограммы, scatter plot и boxplot
+    sample = vis.shared_sample(series, sample_size)
+    
     # Получаем результаты визуализаций
-    histogram_fig = vis.histogram(series)
-    cdf_fig = vis.cdf(pdf_df)
-    scatter_fig = vis.scatter_plot(series)
-    boxplot_fig = vis.boxplot(series)
+    histogram_fig = vis.histogram(series, sample=sample)
+    cdf_fig = vis.cdf(pdf_df, df_dist)
+    scatter_fig = vis.scatter_plot(series, sample=sample)
+    boxplot_fig = vis.boxplot(series, sample=sample)
     
     # Создаем словарь с графиками
     figures_dict = {
@@ -102,13 +92,13 @@ def eda_visualizations(series, pdf_df):
     return figures_dict
 
 
-def EDA(series):
-    # Получаем PDF для CDF
-    pdf_df = stats.pdf_creation(series)
+def EDA(series, backend='pandas', pdf_method='gaussian_kde', df_dist=None):
+    # Получаем PDF для CDF (если передано дискретное распределение - CDF строится по нему точно)
+    pdf_df = stats.pdf_creation(series, method=pdf_method) if df_dist is None else None
     
-    # Получаем статистики и визуализации
-    stats_results = eda_stats(series)
-    vis_results = eda_visualizations(series, pdf_df)
+    # Получаем статистики (backend - 'pandas' или 'polars') и визуализации
+    stats_results = eda_stats(series, backend)
+    vis_results = eda_visualizations(series, pdf_df, df_dist)
 
     return {
         'statistics': stats_results, 
@@ -0,0 +1,131 @@
+"""
+Запуск движка экспериментов из командной строки
+===============================================
+
+Пакетный вход без ноутбучных зависимостей (ipywidgets, IPython, tqdm.notebook):
+для cron-задач и фоновых воркеров. Принимает JSON-конфигурацию эксперимента
+(ту же, что формирует InterfaceWidgets/experiment_config_widgets.py), файл с данными
+и имя колонки, строит дискретное распределение, запускает run_experiment
+(или run_power_sweep) и записывает кривую мощности в CSV, Parquet или JSON.
+
+Пример использования (из корня проекта):
+    python -m ExperimentsCore --config config.json --data revenue.csv --column revenue \\
+        --output power.csv --progress text
+
+    python -m ExperimentsCore --config config.json --data revenue.parquet --column revenue \\
+        --output surface.parquet --mde-sweep 1 2 3 5 10
+
+    python -m ExperimentsCore --config config.json --data huge_export.csv --column revenue \\
+        --output power.csv --chunksize 1000000
+
+    python -m ExperimentsCore --config config.json --data revenue.csv --column revenue \\
+        --output power.csv --checkpoint power.checkpoint
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import pandas as pd
+
+from DataLoader.data_loader import load_data_from_csv, iter_csv_chunks, iter_parquet_chunks
+from ExperimentsCore.experiments_core import discrete_dist_creation, streaming_discrete_dist_creation
+from ExperimentsCore.discrete_sampler import DiscreteSampler
+from ExperimentsCore.experiments_engine import run_experiment, run_power_sweep
+from ExperimentsCore.checkpoint import ExperimentCheckpoint
+
+
+def read_column(path, column):
+    """
+    Читает одну колонку из CSV, Parquet или JSON (по расширению файла).
+
+    Возвращает:
+    pd.Series
+        Значения колонки
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.parquet', '.pq'):
+        return pd.read_parquet(path, columns=[column])[column]
+    if extension == '.json':
+        return pd.read_json(path)[column]
+    # Из CSV читается только нужная колонка; тип не уменьшается, так как значения
+    # становятся носителем распределения, где моменты считаются в исходном типе
+    config = {'file_path': path, 'usecols': [column], 'engine': 'pyarrow'}
+    return load_data_from_csv(config)['df'][column]
+
+
+def build_distribution(path, column, chunksize=None):
+    """
+    Строит дискретное распределение колонки. С chunksize CSV и Parquet читаются
+    чанками, и в памяти хранятся только частоты значений, а не вся колонка.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if chunksize is None or extension == '.json':
+        return discrete_dist_creation(read_column(path, column))
+
+    config = {'file_path': path, 'usecols': [column], 'chunksize': chunksize}
+    chunks = iter_parquet_chunks(config) if extension in ('.parquet', '.pq') else iter_csv_chunks(config)
+    return streaming_discrete_dist_creation(chunks, column=column)
+
+
+def write_results(df_results, path):
+    """
+    Записывает результаты в CSV, Parquet или JSON (по расширению файла).
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension in ('.parquet', '.pq'):
+        df_results.to_parquet(path, index=False)
+    elif extension == '.json':
+        df_results.to_json(path, orient='records', indent=2)
+    else:
+        df_results.to_csv(path, index=False)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m ExperimentsCore',
+        description='Расчет минимального размера выборки для MDE без ноутбука'
+    )
+    parser.add_argument('--config', required=True, help='JSON-файл с конфигурацией эксперимента')
+    parser.add_argument('--data', required=True, help='Файл с данными (.csv, .parquet, .json)')
+    parser.add_argument('--column', required=True, help='Имя анализируемой колонки')
+    parser.add_argument('--output', required=True, help='Файл результата (.csv, .parquet, .json)')
+    parser.add_argument('--progress', choices=['text', 'none'], default='none', help='Вывод прогресса')
+    parser.add_argument('--chunksize', type=int,
+                        help='Потоковое чтение данных чанками по CHUNKSIZE строк (для колонок, не помещающихся в память)')
+    parser.add_argument('--mde-sweep', type=float, nargs='+', metavar='MDE',
+                        help='Список MDE в процентах: вместо одной кривой строится поверхность мощности')
+    parser.add_argument('--checkpoint',
+                        help='Файл контрольных точек: прерванный расчет продолжается с последнего завершенного размера выборки')
+    parser.add_argument('--timings', action='store_true',
+                        help='Вывести время по фазам эмуляции (генерация выборок, эффект, тест)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    with open(args.config, 'r') as f:
+        config = json.load(f)
+
+    rv, _, _ = build_distribution(args.data, args.column, args.chunksize)
+    sampler = DiscreteSampler.from_rv_discrete(rv)
+
+    if args.mde_sweep:
+        df_results = run_power_sweep(sampler, config, args.mde_sweep)
+    else:
+        checkpoint = ExperimentCheckpoint(args.checkpoint) if args.checkpoint else None
+        if args.timings:
+            df_results, metrics = run_experiment(sampler, config, progress=args.progress, checkpoint=checkpoint,
+                                                 return_metrics=True)
+            print(metrics.phase_totals().to_string(), file=sys.stderr)
+        else:
+            df_results = run_experiment(sampler, config, progress=args.progress, checkpoint=checkpoint)
+
+    write_results(df_results, args.output)
+    print(f"Результаты ({len(df_results)} строк) записаны в {args.output}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
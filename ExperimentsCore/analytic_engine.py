@@ -0,0 +1,273 @@
+"""
+Аналитический расчет мощности для калькулятора размера выборки
+==============================================================
+
+Модуль отвечает на тот же вопрос, что и run_experiment из experiments_engine.py,
+но без эмуляций: мощность считается по моментам дискретного распределения
+(rv_discrete из experiments_core.py) через нормальное приближение.
+
+Модель эффекта совпадает с движком эмуляций: экспериментальная выборка - это
+контрольная выборка, сдвинутая на mde_percent от её собственного среднего
+(add_effect_for_mean). Поэтому t-статистика равна
+    t = m * sqrt(n / 2) * (x̄ / s),    m = mde_percent / 100,
+и вся случайность сосредоточена в отношении R = x̄ / s. По дельта-методу
+    R ≈ N(θ, τ² / n),  θ = μ / σ,
+    τ² = 1 - μ·μ3 / σ⁴ + μ²·(μ4 - σ⁴) / (4σ⁶),
+где μ3, μ4 - центральные моменты распределения. Мощность двустороннего теста:
+    power(n) = Φ((√n·|θ| - c) / τ) + Φ((-√n·|θ| - c) / τ),  c = t_crit · √2 / |m|
+
+Для z-теста пропорций (бинарная метрика 0/1 с долей p) случайно только число
+успехов k ~ Binomial(n, p) контрольной выборки, поэтому мощность считается точно:
+    power(n) = Σ_k P(k) · [тест значим для долей k/n и k/n·(1 + m)],
+суммирование по k вне хвостов вероятности меньше BINOMIAL_TAIL_PROBABILITY.
+
+Основные компоненты:
+- distribution_moments: моменты дискретного распределения
+- analytic_power_methods / get_analytic_power_method: формулы мощности по (тест, статистика)
+    - ('t_test', 'mean'): нормальное приближение по дельта-методу
+    - ('z_proportion_test', 'mean'): точная мощность по биномиальному распределению
+- analytic_power_curve: мощность на произвольной сетке размеров выборки
+- analytic_required_sample_size: точный минимальный размер выборки
+- run_analytic_experiment: кривая мощности в формате результата run_experiment
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+from Statistics.stat_test_methods import z_proportion_test_moments
+from Statistics.mde_add_methods import get_moment_effect_adder
+
+# Максимальный размер выборки (совпадает с движком эмуляций)
+MAX_SAMPLE_SIZE = 100000
+
+# Вероятность каждого из отброшенных хвостов биномиального распределения в точной мощности z-теста
+BINOMIAL_TAIL_PROBABILITY = 1e-12
+
+
+def distribution_moments(rv_discrete):
+    """
+    Вычисляет моменты дискретного распределения по его носителю.
+
+    Параметры:
+    rv_discrete : scipy.stats.rv_discrete
+        Дискретное распределение из discrete_dist_creation
+
+    Возвращает:
+    dict
+        mean - среднее, var - дисперсия, mu3 и mu4 - третий и четвертый центральные моменты
+    """
+    xk = np.asarray(rv_discrete.xk, dtype=float)
+    pk = np.asarray(rv_discrete.pk, dtype=float)
+    pk = pk / pk.sum()
+
+    mean = np.dot(xk, pk)
+    deviations = xk - mean
+
+    return {
+        'mean': mean,
+        'var': np.dot(deviations ** 2, pk),
+        'mu3': np.dot(deviations ** 3, pk),
+        'mu4': np.dot(deviations ** 4, pk),
+    }
+
+
+def t_test_mean_power(moments, sample_sizes, mde_percent, alpha):
+    """
+    Мощность t-теста для эффекта в среднем при заданных размерах выборки.
+
+    Параметры:
+    moments : dict
+        Моменты распределения из distribution_moments
+    sample_sizes : numpy.ndarray
+        Размеры выборки (одной группы)
+    mde_percent : float
+        Процентное значение MDE
+    alpha : float
+        Уровень значимости
+
+    Возвращает:
+    numpy.ndarray
+        Мощность для каждого размера выборки
+    """
+    mean, var = moments['mean'], moments['var']
+    if var <= 0:
+        raise ValueError("Аналитический расчет не определен для вырожденного распределения (дисперсия = 0)")
+
+    n = np.asarray(sample_sizes, dtype=float)
+    m = abs(mde_percent) / 100
+    theta = abs(mean) / np.sqrt(var)
+    tau = np.sqrt(max(1 - mean * moments['mu3'] / var ** 2 + mean ** 2 * (moments['mu4'] - var ** 2) / (4 * var ** 3), 0.0))
+
+    if m == 0 or theta == 0:
+        return np.full(n.shape, alpha)
+
+    t_crit = stats.t.ppf(1 - alpha / 2, 2 * n - 2)
+    c = t_crit * np.sqrt(2) / m
+    upper = np.sqrt(n) * theta - c
+    lower = -np.sqrt(n) * theta - c
+
+    if tau == 0:
+        # Отношение x̄ / s не случайно: мощность - ступенька
+        return (upper > 0).astype(float)
+
+    return stats.norm.cdf(upper / tau) + stats.norm.cdf(lower / tau)
+
+
+def z_proportion_mean_power(moments, sample_sizes, mde_percent, alpha):
+    """
+    Точная мощность z-теста пропорций для эффекта в среднем бинарной метрики (0/1).
+
+    Параметры:
+    moments : dict
+        Моменты распределения из distribution_moments
+    sample_sizes : numpy.ndarray
+        Размеры выборки (одной группы)
+    mde_percent : float
+        Процентное значение MDE
+    alpha : float
+        Уровень значимости
+
+    Возвращает:
+    numpy.ndarray
+        Мощность для каждого размера выборки
+    """
+    p = moments['mean']
+    # Только у распределения на {0, 1} дисперсия равна p·(1 - p)
+    if not (0 <= p <= 1 and np.isclose(moments['var'], p * (1 - p))):
+        raise ValueError("Z-тест пропорций требует бинарную метрику со значениями 0 и 1")
+
+    moment_effect_adder = get_moment_effect_adder('mean')
+    power = []
+    for n in np.asarray(sample_sizes, dtype=int):
+        # Все значимые исходы числа успехов k контрольной выборки, кроме пренебрежимых хвостов
+        low = int(stats.binom.ppf(BINOMIAL_TAIL_PROBABILITY, n, p))
+        high = int(stats.binom.isf(BINOMIAL_TAIL_PROBABILITY, n, p))
+        successes = np.arange(low, high + 1)
+
+        proportion_c = successes / n
+        proportion_e, _ = moment_effect_adder(proportion_c, None, mde_percent)
+        _, is_significant = z_proportion_test_moments(proportion_c, None, n, proportion_e, None, n, alpha)
+        power.append(np.dot(stats.binom.pmf(successes, n, p), is_significant))
+
+    return np.array(power)
+
+
+# Словарь аналитических формул мощности по (тест, статистика)
+analytic_power_methods = {
+    ('t_test', 'mean'): t_test_mean_power,
+    ('z_proportion_test', 'mean'): z_proportion_mean_power,
+}
+
+
+def get_analytic_power_method(test_method, statistic):
+    """
+    Возвращает аналитическую формулу мощности для пары (тест, статистика).
+
+    Параметры:
+    test_method : str
+        Имя метода тестирования из конфига
+    statistic : str
+        Имя статистики из конфига
+
+    Возвращает:
+    function
+        Функция (moments, sample_sizes, mde_percent, alpha) -> numpy.ndarray
+    """
+    key = (test_method, statistic)
+    if key not in analytic_power_methods:
+        raise ValueError(f"Аналитический расчет недоступен для теста '{test_method}' и статистики '{statistic}'")
+    return analytic_power_methods[key]
+
+
+def analytic_power_curve(rv_discrete, config, sample_sizes):
+    """
+    Вычисляет мощность на заданной сетке размеров выборки.
+
+    Параметры:
+    rv_discrete : scipy.stats.rv_discrete
+        Дискретное распределение
+    config : dict
+        Конфигурация эксперимента (alpha, mde_percent, statistic, test_method)
+    sample_sizes : array-like
+        Размеры выборки
+
+    Возвращает:
+    pd.DataFrame
+        Колонки sample_size и power
+    """
+    power_method = get_analytic_power_method(config['test_method'], config['statistic'])
+    moments = distribution_moments(rv_discrete)
+    sample_sizes = np.asarray(sample_sizes, dtype=int)
+
+    power = power_method(moments, sample_sizes, config['mde_percent'], config['alpha'])
+
+    return pd.DataFrame({
+        'sample_size': sample_sizes,
+        'power': power
+    })
+
+
+def analytic_required_sample_size(rv_discrete, config, max_sample_size=MAX_SAMPLE_SIZE):
+    """
+    Находит минимальный размер выборки с мощностью не ниже target_power.
+
+    Мощность монотонно растет с размером выборки, поэтому используется
+    бинарный поиск с точностью до одного наблюдения.
+
+    Параметры:
+    rv_discrete : scipy.stats.rv_discrete
+        Дискретное распределение
+    config : dict
+        Конфигурация эксперимента
+    max_sample_size : int
+        Верхняя граница поиска
+
+    Возвращает:
+    int или None
+        Минимальный размер выборки или None, если цель не достигается до max_sample_size
+    """
+    power_method = get_analytic_power_method(config['test_method'], config['statistic'])
+    moments = distribution_moments(rv_discrete)
+
+    def power_at(n):
+        return power_method(moments, np.array([n]), config['mde_percent'], config['alpha'])[0]
+
+    if power_at(max_sample_size) < config['target_power']:
+        return None
+
+    low, high = 2, max_sample_size
+    while low < high:
+        middle = (low + high) // 2
+        if power_at(middle) >= config['target_power']:
+            high = middle
+        else:
+            low = middle + 1
+
+    return low
+
+
+def run_analytic_experiment(rv_discrete, config, max_sample_size=MAX_SAMPLE_SIZE):
+    """
+    Строит кривую мощности на той же сетке, что и run_experiment:
+    от sample_size с шагом sample_step до первого размера с достаточной мощностью.
+
+    Параметры:
+    rv_discrete : scipy.stats.rv_discrete
+        Дискретное распределение
+    config : dict
+        Конфигурация эксперимента
+    max_sample_size : int
+        Максимальный размер выборки
+
+    Возвращает:
+    pd.DataFrame
+        Колонки sample_size и power
+    """
+    grid = np.arange(config['sample_size'], max_sample_size + 1, config['sample_step'])
+    curve = analytic_power_curve(rv_discrete, config, grid)
+
+    reached = np.flatnonzero(curve['power'].values >= config['target_power'])
+    if len(reached) > 0:
+        curve = curve.iloc[:reached[0] + 1]
+
+    return curve.reset_index(drop=True)
@@ -0,0 +1,124 @@
+"""
+Фоновый запуск эксперимента
+===========================
+
+run_experiment, запущенный из обработчика виджета, выполняется в потоке ядра
+и блокирует ноутбук на все время расчета. start_experiment запускает его в
+фоновом потоке и сразу возвращает дескриптор ExperimentRun в стиле
+concurrent.futures.Future:
+- cancel(): просит движок остановиться (проверяется перед каждым размером
+  выборки, между порциями и блоками эмуляций)
+- done(), running(), cancelled(): состояние расчета; cancelled() истинно, только
+  если расчет завершился из-за отмены (отмена, запрошенная после завершения
+  последнего размера выборки, расчет отмененным не делает)
+- result(timeout=None): DataFrame с результатами; после отмены - уже
+  посчитанные точки, df_results.attrs['cancelled'] == True
+- add_done_callback(fn): вызов fn(run) по завершении (в фоновом потоке)
+
+Прогресс передается через тот же on_progress_update, что и у run_experiment
+(вызывается из фонового потока). Прогресс-бар tqdm не используется.
+
+Пример использования:
+    run = start_experiment(rv_discrete, config, on_progress_update=update_progress)
+    ...
+    run.cancel()
+    partial_results = run.result()
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ExperimentsCore.experiments_engine import run_experiment
+
+
+class ExperimentRun:
+    """
+    Дескриптор эксперимента, выполняемого в фоновом потоке.
+
+    Параметры:
+    future : concurrent.futures.Future
+        Future с результатом run_experiment
+    cancel_event : threading.Event
+        Событие отмены, переданное в run_experiment
+    config : dict
+        Конфигурация эксперимента
+    """
+
+    def __init__(self, future, cancel_event, config):
+        self._future = future
+        self._cancel_event = cancel_event
+        self.config = config
+
+    def cancel(self):
+        """
+        Запрашивает остановку расчета. Возвращает False, если расчет уже завершен.
+        """
+        if self._future.done():
+            return False
+        self._cancel_event.set()
+        return True
+
+    def cancelled(self):
+        """
+        Завершился ли расчет из-за отмены (False, пока расчет идет или если он закончился до отмены).
+        """
+        if not self._future.done() or self._future.exception() is not None:
+            return False
+        return bool(self._future.result().attrs.get('cancelled', False))
+
+    def done(self):
+        return self._future.done()
+
+    def running(self):
+        return self._future.running()
+
+    def result(self, timeout=None):
+        """
+        Ожидает завершения и возвращает DataFrame результатов (частичный после отмены).
+        """
+        return self._future.result(timeout)
+
+    def exception(self, timeout=None):
+        return self._future.exception(timeout)
+
+    def add_done_callback(self, fn):
+        """
+        Вызывает fn(run) по завершении расчета (сразу, если расчет уже завершен).
+        """
+        self._future.add_done_callback(lambda _: fn(self))
+
+
+def start_experiment(rv_discrete, config, on_progress_update=None, result_cache=None, checkpoint=None):
+    """
+    Запускает run_experiment в фоновом потоке.
+
+    Параметры:
+    rv_discrete : scipy.stats.rv_discrete или DiscreteSampler
+        Дискретное распределение для генерации выборок
+    config : dict
+        Конфигурация эксперимента (см. run_experiment)
+    on_progress_update : callable, optional
+        Функция обратного вызова (current_size, power, target_power, iteration, total_iterations)
+    result_cache : PowerResultCache, optional
+        Кеш мощности по размерам выборки
+    checkpoint : ExperimentCheckpoint, optional
+        Файл контрольных точек: отмененный или прерванный расчет продолжается с
+        последнего завершенного размера выборки
+
+    Возвращает:
+    ExperimentRun
+        Дескриптор запущенного расчета
+    """
+    cancel_event = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='experiment')
+    future = executor.submit(
+        run_experiment, rv_discrete, config,
+        on_progress_update=on_progress_update,
+        result_cache=result_cache,
+        progress='none',
+        cancel_event=cancel_event,
+        checkpoint=checkpoint
+    )
+    # Поток завершится вместе с задачей, новые задачи в этот пул не отправляются
+    executor.shutdown(wait=False)
+    return ExperimentRun(future, cancel_event, config)
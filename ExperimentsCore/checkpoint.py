@@ -0,0 +1,205 @@
+"""
+Контрольные точки долгих расчетов run_experiment
+================================================
+
+Расчет с большим num_emulations и мелким sample_step может идти часами, а
+перезапуск ядра теряет все посчитанные размеры выборки. ExperimentCheckpoint
+дописывает в локальный файл запись о каждом завершенном размере выборки:
+(sample_size, power, emulations, состояние генератора). Повторный запуск с той
+же конфигурацией и теми же данными продолжает расчет с последнего завершенного
+размера: готовые точки берутся из файла, состояние генератора восстанавливается,
+поэтому продолжение дает те же числа, что и непрерывный расчет. Движок с
+состоянием ('incremental') дополнительно сохраняет накопленные суммы выборок
+в соседний файл <path>.engine.npz.
+
+Файл описывает только незавершенный расчет: run_experiment удаляет его после
+успешного завершения, поэтому повторный запуск завершенного эксперимента
+считается заново, а не берется из старого файла.
+
+Формат файла - JSON Lines: первая строка - заголовок с ключом (отпечаток
+распределения и конфигурация) и использованным seed, далее - по строке на
+размер выборки. Каждая запись несет хеш ключа своего расчета: запись, которую
+отмененный расчет успел дописать после начала нового, при чтении пропускается.
+Недописанная последняя строка (сбой во время записи) тоже пропускается.
+
+ExperimentCheckpoint.for_run выбирает отдельный файл для каждого расчета (имя -
+хеш ключа) в общем каталоге: запуски с разными конфигурациями или данными - в том
+числе в разных ядрах - не пишут в один файл и не удаляют контрольные точки друг
+друга. Одновременные запуски одного и того же расчета пишут в один файл одинаковые
+точки (seed берется из заголовка файла).
+
+Генераторы восстанавливаются только локальные (numpy.random.Generator):
+глобальное состояние numpy.random не читается и не перезаписывается, что
+безопасно для запуска в фоновом потоке (background_runner.py).
+
+Пример использования:
+    checkpoint = ExperimentCheckpoint('~/.cache/mde_calculator/run.checkpoint')
+    results = run_experiment(rv_discrete, config, checkpoint=checkpoint)
+
+    checkpoint = ExperimentCheckpoint.for_run('~/.cache/mde_calculator/checkpoints', rv_discrete, config)
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from ExperimentsCore.power_cache import distribution_fingerprint
+
+# Ключи конфигурации, не влияющие на результат (не входят в ключ контрольной точки)
+IGNORED_CONFIG_FIELDS = ('n_jobs', 'max_block_elements')
+
+
+def make_checkpoint_key(rv_discrete, config):
+    """
+    Формирует ключ контрольной точки по распределению и конфигурации эксперимента.
+    """
+    fields = {field: value for field, value in config.items() if field not in IGNORED_CONFIG_FIELDS}
+    fields['distribution'] = distribution_fingerprint(rv_discrete)
+    return json.dumps(fields, sort_keys=True, default=str)
+
+
+def _key_digest(key):
+    """
+    Короткий хеш ключа для записей о размерах выборки.
+    """
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def rng_state(generator):
+    """
+    Сериализуемое состояние numpy.random.Generator.
+    """
+    return generator.bit_generator.state
+
+
+def restore_rng_state(state, generator):
+    """
+    Восстанавливает состояние, сохраненное rng_state.
+    """
+    generator.bit_generator.state = state
+
+
+class ExperimentCheckpoint:
+    """
+    Файл контрольных точек одного расчета run_experiment.
+
+    Параметры:
+    path : str
+        Путь к файлу контрольных точек
+    """
+
+    def __init__(self, path):
+        self.path = os.path.expanduser(path)
+        self.engine_state_path = self.path + '.engine.npz'
+
+    @classmethod
+    def for_run(cls, directory, rv_discrete, config):
+        """
+        Файл контрольных точек расчета в каталоге directory с именем по хешу ключа расчета.
+        """
+        digest = _key_digest(make_checkpoint_key(rv_discrete, config))
+        return cls(os.path.join(os.path.expanduser(directory), f'{digest}.checkpoint'))
+
+    def load(self, key):
+        """
+        Читает контрольные точки расчета с ключом key.
+
+        Возвращает:
+        dict или None
+            seed - использованный seed, points - {sample_size: (power, emulations)},
+            rng_state - состояние генератора после последней точки (или None),
+            engine_state - состояние движка после последней точки (или None);
+            None, если файла нет или он относится к другому расчету
+        """
+        if not os.path.exists(self.path):
+            return None
+
+        with open(self.path, 'r') as f:
+            lines = f.read().splitlines()
+
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                # Недописанная строка - расчет прервался во время записи
+                break
+
+        if not records or records[0].get('type') != 'header' or records[0].get('key') != key:
+            return None
+
+        points = {}
+        last_size = None
+        last_rng_state = None
+        digest = _key_digest(key)
+        for record in records[1:]:
+            if record.get('key') != digest:
+                continue
+            points[record['sample_size']] = (record['power'], record['emulations'])
+            last_size = record['sample_size']
+            last_rng_state = record.get('rng_state')
+
+        return {
+            'seed': records[0].get('seed'),
+            'points': points,
+            'rng_state': last_rng_state,
+            'engine_state': self._load_engine_state(digest, last_size)
+        }
+
+    def _load_engine_state(self, digest, last_size):
+        """
+        Состояние движка, если оно записано после той же последней точки того же расчета.
+        """
+        if last_size is None or not os.path.exists(self.engine_state_path):
+            return None
+        with np.load(self.engine_state_path) as data:
+            arrays = {name: data[name] for name in data.files}
+        if str(arrays.pop('_key')) != digest or int(arrays.pop('_sample_size')) != last_size:
+            # Сбой между записью состояния и записью точки - состояние опережает файл
+            return None
+        return arrays
+
+    def start(self, key, seed=None):
+        """
+        Начинает новый файл контрольных точек (предыдущее содержимое удаляется).
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.engine_state_path):
+            os.remove(self.engine_state_path)
+        with open(self.path, 'w') as f:
+            f.write(json.dumps({'type': 'header', 'key': key, 'seed': None if seed is None else int(seed)}) + '\n')
+
+    def append(self, key, sample_size, power, emulations, state=None, engine_state=None):
+        """
+        Дописывает завершенный размер выборки расчета с ключом key и сбрасывает запись на диск.
+        engine_state - словарь массивов состояния движка (пишется атомарно до записи точки).
+        """
+        if engine_state is not None:
+            tmp_path = self.engine_state_path + '.tmp.npz'
+            np.savez(tmp_path, _key=_key_digest(key), _sample_size=int(sample_size), **engine_state)
+            os.replace(tmp_path, self.engine_state_path)
+
+        record = {
+            'type': 'point',
+            'key': _key_digest(key),
+            'sample_size': int(sample_size),
+            'power': float(power),
+            'emulations': int(emulations),
+            'rng_state': state
+        }
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def clear(self):
+        """
+        Удаляет файл контрольных точек и состояние движка.
+        """
+        for path in (self.path, self.engine_state_path):
+            if os.path.exists(path):
+                os.remove(path)
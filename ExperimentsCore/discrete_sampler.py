@@ -0,0 +1,173 @@
+"""
+Быстрый сэмплер дискретного распределения
+=========================================
+
+scipy.stats.rv_discrete.rvs на каждый вызов проходит общую машинерию scipy
+(проверка аргументов, ppf) и внутри сравнивает каждое значение со всеми K
+точками носителя - O(n·K) по времени и памяти. Движок эмуляций и бутстрэп
+средних вызывают его тысячи раз.
+
+DiscreteSampler строится по тем же xk/pk, что и rv_discrete из
+discrete_dist_creation, хранит компактные индексы носителя (uint16/uint32)
+и генерирует выборку за O(n):
+- 'alias': таблица псевдонимов Уокера-Воуза, O(1) на значение
+- 'searchsorted': обратная функция распределения бинарным поиском, O(log K) на значение
+
+Сэмплер повторяет используемую в проекте часть интерфейса rv_discrete
+(xk, pk, rvs, mean, var, std), поэтому его можно передавать везде, где сейчас
+передается rv_discrete.
+
+Пример использования:
+    rv, df_dist, round_digits = discrete_dist_creation(series)
+    sampler = DiscreteSampler.from_rv_discrete(rv)
+    results = run_experiment(sampler, config)
+"""
+
+import numpy as np
+
+
+def _index_dtype(support_size):
+    """
+    Минимальный беззнаковый тип для индексов носителя.
+    """
+    return np.uint16 if support_size <= np.iinfo(np.uint16).max + 1 else np.uint32
+
+
+def _build_alias_table(pk):
+    """
+    Строит таблицу псевдонимов методом Воуза.
+
+    Параметры:
+    pk : numpy.ndarray
+        Нормированные вероятности носителя
+
+    Возвращает:
+    tuple
+        (prob, alias) - вероятность оставить индекс и индекс-псевдоним для каждой ячейки
+    """
+    support_size = len(pk)
+    scaled = pk * support_size
+    prob = np.ones(support_size)
+    alias = np.arange(support_size, dtype=_index_dtype(support_size))
+
+    small = [i for i in range(support_size) if scaled[i] < 1.0]
+    large = [i for i in range(support_size) if scaled[i] >= 1.0]
+
+    while small and large:
+        less, more = small.pop(), large.pop()
+        prob[less] = scaled[less]
+        alias[less] = more
+        scaled[more] = scaled[more] + scaled[less] - 1.0
+        if scaled[more] < 1.0:
+            small.append(more)
+        else:
+            large.append(more)
+
+    # Оставшиеся ячейки заполнены полностью (с точностью до округления)
+    for i in small + large:
+        prob[i] = 1.0
+
+    return prob, alias
+
+
+def _generator(random_state):
+    """
+    Приводит random_state к генератору: None - глобальное состояние numpy
+    (как у rv_discrete.rvs), int - новый numpy.random.Generator с этим seed.
+    """
+    if random_state is None:
+        return np.random
+    if isinstance(random_state, (int, np.integer)):
+        return np.random.default_rng(random_state)
+    return random_state
+
+
+class DiscreteSampler:
+    """
+    Сэмплер дискретного распределения с явным генератором numpy.
+
+    Параметры:
+    xk : array-like
+        Значения носителя
+    pk : array-like
+        Вероятности значений (нормируются)
+    method : str
+        'alias' (по умолчанию) или 'searchsorted'
+    """
+
+    methods = ('alias', 'searchsorted')
+
+    def __init__(self, xk, pk, method='alias'):
+        if method not in self.methods:
+            raise ValueError(f"Неизвестный метод сэмплирования: '{method}'")
+
+        self.xk = np.asarray(xk, dtype=float)
+        pk = np.asarray(pk, dtype=float)
+        self.pk = pk / pk.sum()
+        self.method = method
+        self.index_dtype = _index_dtype(len(self.xk))
+
+        if method == 'alias':
+            self._prob, self._alias = _build_alias_table(self.pk)
+        else:
+            self._cdf = np.cumsum(self.pk)
+            self._cdf[-1] = 1.0
+
+    @classmethod
+    def from_rv_discrete(cls, rv_discrete, method='alias'):
+        """
+        Создает сэмплер по rv_discrete из discrete_dist_creation.
+        """
+        return cls(rv_discrete.xk, rv_discrete.pk, method)
+
+    @classmethod
+    def from_df_dist(cls, df_dist, method='alias'):
+        """
+        Создает сэмплер по df_dist (колонки value и probability) из discrete_dist_creation.
+        """
+        return cls(df_dist['value'].values, df_dist['probability'].values, method)
+
+    def sample_indices(self, size=None, random_state=None):
+        """
+        Генерирует индексы носителя (uint16/uint32).
+
+        Параметры:
+        size : int или tuple, optional
+            Форма результата
+        random_state : numpy.random.Generator, numpy.random.RandomState, int или None
+            Источник случайности (None - глобальное состояние numpy)
+
+        Возвращает:
+        numpy.ndarray
+            Индексы значений в xk
+        """
+        generator = _generator(random_state)
+        support_size = len(self.xk)
+
+        if self.method == 'alias':
+            # Одна равномерная величина дает и ячейку (целая часть), и монетку (дробная часть)
+            scaled = np.asarray(generator.random(size)) * support_size
+            cells = np.minimum(scaled, support_size - 1).astype(self.index_dtype)
+            keep = (scaled - cells) < self._prob[cells]
+            return np.where(keep, cells, self._alias[cells])
+
+        indices = np.searchsorted(self._cdf, np.asarray(generator.random(size)), side='right')
+        return np.minimum(indices, support_size - 1).astype(self.index_dtype)
+
+    def rvs(self, size=None, random_state=None):
+        """
+        Генерирует значения распределения (интерфейс rv_discrete.rvs).
+        """
+        return self.xk[self.sample_indices(size, random_state)]
+
+    def mean(self):
+        return np.dot(self.xk, self.pk)
+
+    def var(self):
+        return np.dot((self.xk - self.mean()) ** 2, self.pk)
+
+    def std(self):
+        return np.sqrt(self.var())
+
+    def __repr__(self):
+        return f"DiscreteSampler(method='{self.method}', support_size={len(self.xk)})"
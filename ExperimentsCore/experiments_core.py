@@ -1,8 +1,34 @@
+import hashlib
+import os
+import warnings
+from collections import OrderedDict
+
 import numpy as np
 import pandas as pd
 from scipy import stats
 
-def discrete_dist_creation(series, round_digits=None, adaptive_rounding=True):
+from Statistics.statistics import get_statistics_backend
+
+# Максимальное число знаков адаптивного округления
+MAX_ROUND_DIGITS = 6
+
+
+def _adaptive_round_digits(std_dev):
+    """
+    Выбирает число знаков округления по стандартному отклонению данных.
+    """
+    # Защита от нулевого стандартного отклонения
+    if std_dev == 0 or not np.isfinite(std_dev):
+        return 2  # Значение по умолчанию
+    
+    # Расчёт оптимального числа знаков на основе стандартного отклонения
+    round_digits = max(0, -int(np.floor(np.log10(std_dev))) + 2)
+    
+    # Ограничение максимального количества знаков для практичности
+    return min(round_digits, MAX_ROUND_DIGITS)
+
+
+def discrete_dist_creation(series, round_digits=None, adaptive_rounding=True, backend='pandas'):
     """
     Создает дискретное распределение для числового ряда с адаптивным округлением.
     
@@ -11,6 +37,7 @@ def discrete_dist_creation(series, round_digits=None, adaptive_rounding=True):
         round_digits (int, optional): Количество знаков после запятой для округления.
                                     Если None и adaptive_rounding=True, будет выбрано автоматически.
         adaptive_rounding (bool): Использовать ли адаптивное округление
+        backend (str): Бэкенд подсчета частот: 'pandas' (по умолчанию) или 'polars'
         
     Returns:
         tuple: (rv_discrete, df_dist, round_digits), где
@@ -24,17 +51,7 @@ def discrete_dist_creation(series, round_digits=None, adaptive_rounding=True):
     # Определяем количество знаков для округления
     if adaptive_rounding and round_digits is None:
         # Получаем стандартное отклонение данных
-        std_dev = np.std(data)
-        
-        # Защита от нулевого стандартного отклонения
-        if std_dev == 0:
-            round_digits = 2  # Значение по умолчанию
-        else:
-            # Расчёт оптимального числа знаков на основе стандартного отклонения
-            round_digits = max(0, -int(np.floor(np.log10(std_dev))) + 2)
-            
-            # Ограничение максимального количества знаков для практичности
-            round_digits = min(round_digits, 6)
+        round_digits = _adaptive_round_digits(np.std(data))
     elif round_digits is None:
         round_digits = 2  # Значение по умолчанию
     
@@ -42,11 +59,15 @@ def discrete_dist_creation(series, round_digits=None, adaptive_rounding=True):
     rounded_data = np.round(data, round_digits)
     
     # Подсчитываем частоты округленных значений
-    value_counts = pd.Series(rounded_data).value_counts(normalize=True).sort_index()
-    
-    # Преобразуем в массивы значений и вероятностей
-    xk = value_counts.index.values
-    pk = value_counts.values
+    if backend == 'pandas':
+        value_counts = pd.Series(rounded_data).value_counts(normalize=True).sort_index()
+        
+        # Преобразуем в массивы значений и вероятностей
+        xk = value_counts.index.values
+        pk = value_counts.values
+    else:
+        xk, counts = get_statistics_backend(backend).support_counts(np.asarray(rounded_data))
+        pk = counts / counts.sum()
     
     # Создаем дискретное распределение
     rv = stats.rv_discrete(values=(xk, pk))
@@ -58,4 +79,328 @@ def discrete_dist_creation(series, round_digits=None, adaptive_rounding=True):
         'cumulative_probability': np.cumsum(pk)
     })
     
-    return rv, df_dist, round_digits  # Возвращаем также использованное округление
\ No newline at end of file
+    return rv, df_dist, round_digits  # Возвращаем также использованное округление
+
+
+def _series_fingerprint(series):
+    """
+    Вычисляет отпечаток содержимого ряда (значения и тип, без индекса).
+    
+    Args:
+        series (pd.Series): Входной ряд
+        
+    Returns:
+        str: Шестнадцатеричный хеш blake2b
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(series.dtype).encode())
+    digest.update(str(len(series)).encode())
+    
+    if pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_extension_array_dtype(series.dtype):
+        # Числовой ряд хешируется напрямую по байтам значений
+        digest.update(np.ascontiguousarray(series.to_numpy()).tobytes())
+    else:
+        digest.update(pd.util.hash_pandas_object(series, index=False).to_numpy().tobytes())
+    
+    return digest.hexdigest()
+
+
+def _distribution_from_support(xk, pk):
+    """
+    Собирает (rv_discrete, df_dist) по носителю и вероятностям так же, как discrete_dist_creation.
+    """
+    rv = stats.rv_discrete(values=(xk, pk))
+    df_dist = pd.DataFrame({
+        'value': xk,
+        'probability': pk,
+        'cumulative_probability': np.cumsum(pk)
+    })
+    return rv, df_dist
+
+
+class DistributionCache:
+    """
+    Кеш дискретных распределений: LRU в памяти и необязательное хранилище npz на диске.
+    
+    Ключ - отпечаток содержимого ряда и параметры округления, поэтому повторный
+    выбор той же колонки (и перезапуск ноутбука при включенном диске) не пересчитывает
+    стандартное отклонение, округление и value_counts.
+    
+    Args:
+        maxsize (int): Максимальное число распределений в памяти
+        cache_dir (str, optional): Папка для хранения на диске (None - только память)
+    """
+    
+    def __init__(self, maxsize=16, cache_dir=None):
+        self.maxsize = maxsize
+        self.cache_dir = cache_dir
+        self._entries = OrderedDict()  # key -> (xk, pk, round_digits)
+    
+    @staticmethod
+    def make_key(series, round_digits=None, adaptive_rounding=True):
+        """
+        Формирует ключ кеша по содержимому ряда и параметрам округления.
+        """
+        return f"{_series_fingerprint(series)}-r{round_digits}-a{int(bool(adaptive_rounding))}"
+    
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.npz")
+    
+    def get(self, key):
+        """
+        Возвращает (xk, pk, round_digits) по ключу или None.
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        
+        if self.cache_dir is not None and os.path.exists(self._path(key)):
+            with np.load(self._path(key)) as stored:
+                entry = (stored['xk'], stored['pk'], int(stored['round_digits']))
+            self._remember(key, entry)
+            return entry
+        
+        return None
+    
+    def put(self, key, xk, pk, round_digits):
+        """
+        Сохраняет носитель и вероятности в память и, если задана папка, на диск.
+        """
+        entry = (np.asarray(xk), np.asarray(pk), int(round_digits))
+        self._remember(key, entry)
+        
+        if self.cache_dir is not None:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Пишем во временный файл и переименовываем, чтобы не оставить битый файл
+            temporary_path = self._path(key) + '.tmp'
+            with open(temporary_path, 'wb') as f:
+                np.savez(f, xk=entry[0], pk=entry[1], round_digits=entry[2])
+            os.replace(temporary_path, self._path(key))
+    
+    def _remember(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def clear(self):
+        """
+        Очищает кеш в памяти (файлы на диске не удаляются).
+        """
+        self._entries.clear()
+
+
+# Кеш распределений по умолчанию (только в памяти)
+distribution_cache = DistributionCache()
+
+
+def cached_discrete_dist_creation(series, round_digits=None, adaptive_rounding=True, cache=None, backend='pandas'):
+    """
+    То же, что discrete_dist_creation, но с кешем по содержимому ряда.
+    
+    Args:
+        series (pd.Series): Входной числовой ряд
+        round_digits (int, optional): Количество знаков после запятой для округления
+        adaptive_rounding (bool): Использовать ли адаптивное округление
+        cache (DistributionCache, optional): Кеш (по умолчанию distribution_cache)
+        backend (str): Бэкенд подсчета частот (на результат и ключ кеша не влияет)
+        
+    Returns:
+        tuple: (rv_discrete, df_dist, round_digits), как у discrete_dist_creation
+    """
+    cache = distribution_cache if cache is None else cache
+    key = cache.make_key(series, round_digits, adaptive_rounding)
+    
+    entry = cache.get(key)
+    if entry is not None:
+        xk, pk, used_round_digits = entry
+        rv, df_dist = _distribution_from_support(xk, pk)
+        return rv, df_dist, used_round_digits
+    
+    rv, df_dist, used_round_digits = discrete_dist_creation(series, round_digits, adaptive_rounding, backend)
+    cache.put(key, df_dist['value'].values, df_dist['probability'].values, used_round_digits)
+    
+    return rv, df_dist, used_round_digits
+
+
+# Число непустых значений, по которым оценивается стандартное отклонение
+# до выбора рабочей точности потокового построения
+STREAMING_WARMUP_ROWS = 100_000
+
+
+class StreamingDistributionBuilder:
+    """
+    Потоковое построение дискретного распределения по чанкам данных.
+    
+    Результат совпадает с discrete_dist_creation на всех данных, но в памяти
+    хранятся только частоты значений носителя, а не сами значения.
+    
+    Адаптивное округление требует стандартного отклонения всех данных, которое
+    известно только в конце потока. Поэтому:
+    - моменты (n, среднее, сумма квадратов отклонений) объединяются по чанкам (формула Чана);
+    - первые warmup_rows значений буферизуются, по ним выбирается рабочая точность
+      (адаптивное округление + guard_digits знаков, не более MAX_ROUND_DIGITS);
+    - частоты копятся по значениям, округленным до рабочей точности, отдельно
+      для значений ниже и выше округленного (знак разности); значения, совпадающие
+      с узлом рабочей сетки, хранятся как есть;
+    - в конце число знаков выбирается по итоговому отклонению, и частоты переводятся
+      к нему: знак разности однозначно определяет, в какую сторону округлилось бы
+      исходное значение, поэтому двойного округления не возникает.
+    
+    Если итоговое отклонение требует больше знаков, чем рабочая точность
+    (отклонение упало более чем в 10^guard_digits раз после прогрева), используется
+    рабочая точность и выдается предупреждение.
+    
+    Args:
+        round_digits (int, optional): Количество знаков после запятой (как в discrete_dist_creation)
+        adaptive_rounding (bool): Использовать ли адаптивное округление
+        warmup_rows (int): Число значений для оценки рабочей точности
+        guard_digits (int): Запас знаков рабочей точности
+    
+    Пример использования:
+        builder = StreamingDistributionBuilder()
+        for chunk in pd.read_csv(path, usecols=['revenue'], chunksize=1_000_000):
+            builder.update(chunk['revenue'])
+        rv, df_dist, round_digits = builder.result()
+    """
+    
+    def __init__(self, round_digits=None, adaptive_rounding=True, warmup_rows=STREAMING_WARMUP_ROWS, guard_digits=1):
+        if round_digits is None and not adaptive_rounding:
+            round_digits = 2  # Значение по умолчанию
+        
+        self.round_digits = round_digits
+        self.warmup_rows = warmup_rows
+        self.guard_digits = guard_digits
+        
+        # Рабочая точность известна сразу, если округление задано явно
+        self.working_digits = round_digits
+        self._warmup = []
+        self._warmup_size = 0
+        
+        # Моменты потока: количество, среднее и сумма квадратов отклонений
+        self.count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        
+        # Частоты по знаку разности (значение - округленное): -1 и 1 - по округленным
+        # значениям, 0 - по исходным значениям, совпадающим с узлом сетки
+        self._counts = {sign: pd.Series(dtype='int64') for sign in (-1, 0, 1)}
+    
+    def _update_moments(self, values):
+        count = len(values)
+        mean = values.mean()
+        m2 = np.sum((values - mean) ** 2)
+        
+        total = self.count + count
+        delta = mean - self._mean
+        self._m2 += m2 + delta ** 2 * self.count * count / total
+        self._mean += delta * count / total
+        self.count = total
+    
+    def std(self):
+        """
+        Стандартное отклонение (ddof=0, как np.std) по всем полученным значениям.
+        """
+        return np.sqrt(self._m2 / self.count) if self.count > 0 else np.nan
+    
+    def _accumulate(self, values):
+        rounded = np.round(values, self.working_digits)
+        deviations = values - rounded
+        signs = np.sign(deviations)
+        
+        # Значения в пределах машинной точности от узла сетки могут оказаться серединой
+        # шага итогового округления - для них храним сами значения (знак 0)
+        signs[np.abs(deviations) <= 16 * np.spacing(np.abs(values))] = 0
+        
+        for sign in (-1, 0, 1):
+            mask = signs == sign
+            if mask.any():
+                keys = values[mask] if sign == 0 else rounded[mask]
+                counts = pd.Series(keys).value_counts()
+                self._counts[sign] = self._counts[sign].add(counts, fill_value=0).astype('int64')
+    
+    def _flush_warmup(self):
+        if self.working_digits is None:
+            self.working_digits = min(_adaptive_round_digits(self.std()) + self.guard_digits, MAX_ROUND_DIGITS)
+        if self._warmup:
+            self._accumulate(np.concatenate(self._warmup))
+        self._warmup = []
+        self._warmup_size = 0
+    
+    def update(self, chunk):
+        """
+        Добавляет чанк данных (pd.Series, numpy.ndarray или список); пропуски отбрасываются.
+        """
+        values = np.asarray(pd.Series(chunk).dropna(), dtype=float)
+        if len(values) == 0:
+            return
+        
+        self._update_moments(values)
+        
+        if self.working_digits is not None:
+            self._accumulate(values)
+            return
+        
+        self._warmup.append(values)
+        self._warmup_size += len(values)
+        if self._warmup_size >= self.warmup_rows:
+            self._flush_warmup()
+    
+    def result(self):
+        """
+        Возвращает (rv_discrete, df_dist, round_digits), как discrete_dist_creation.
+        """
+        if self.count == 0:
+            raise ValueError("Нет данных для построения распределения")
+        
+        round_digits = self.round_digits
+        if round_digits is None:
+            round_digits = _adaptive_round_digits(self.std())
+            if self.working_digits is None:
+                # Поток закончился до конца прогрева - рабочая точность равна итоговой
+                self.working_digits = round_digits
+        
+        self._flush_warmup()
+        
+        if round_digits > self.working_digits:
+            warnings.warn(
+                f"Итоговое округление требует {round_digits} знаков, но частоты накоплены с точностью "
+                f"{self.working_digits}; используется {self.working_digits}. Увеличьте warmup_rows или guard_digits."
+            )
+            round_digits = self.working_digits
+        
+        # Сдвиг на четверть шага рабочей сетки в сторону исходного значения
+        quarter_step = 0.25 * 10.0 ** (-self.working_digits)
+        final_counts = []
+        for sign, counts in self._counts.items():
+            if len(counts) > 0:
+                values = np.round(counts.index.values + sign * quarter_step, round_digits)
+                final_counts.append(pd.Series(counts.values, index=values))
+        
+        counts = pd.concat(final_counts).groupby(level=0).sum().sort_index()
+        xk = counts.index.values
+        pk = counts.values / counts.values.sum()
+        
+        rv, df_dist = _distribution_from_support(xk, pk)
+        return rv, df_dist, round_digits
+
+
+def streaming_discrete_dist_creation(chunks, round_digits=None, adaptive_rounding=True,
+                                     warmup_rows=STREAMING_WARMUP_ROWS, column=None):
+    """
+    Строит дискретное распределение по итератору чанков (CSV, Parquet, курсор запроса).
+    
+    Args:
+        chunks (iterable): Чанки данных - pd.Series, numpy.ndarray или pd.DataFrame (с column)
+        round_digits (int, optional): Количество знаков после запятой для округления
+        adaptive_rounding (bool): Использовать ли адаптивное округление
+        warmup_rows (int): Число значений для оценки рабочей точности
+        column (str, optional): Колонка, если чанки - датафреймы
+        
+    Returns:
+        tuple: (rv_discrete, df_dist, round_digits), как у discrete_dist_creation
+    """
+    builder = StreamingDistributionBuilder(round_digits, adaptive_rounding, warmup_rows)
+    for chunk in chunks:
+        builder.update(chunk[column] if column is not None else chunk)
+    return builder.result()
@@ -9,13 +9,49 @@
 Основные компоненты:
 - Функция run_experiment: основной интерфейс для запуска экспериментов
 - Внутренние функции для генерации выборок и оценки мощности
+- Словарь engines: способы проведения эмуляций для одного размера выборки
+    - 'loop': поштучный цикл по эмуляциям (любые статистики и тесты)
+    - 'batch': блок (эмуляции × размер выборки) за раз, тест по моментам в numpy
+    - 'multinomial': частоты значений носителя вместо самих значений (стоимость ~ K, а не n)
+    - 'binomial': для бинарных метрик (конверсии) - одно биномиальное число успехов на эмуляцию
+    - 'incremental': общие случайные числа - выборка размера n + step продолжает выборку
+      размера n, на каждом шаге генерируется только step новых значений
+- Воспроизводимость и параллелизм (ключи 'seed' и 'n_jobs'): порции эмуляций получают
+  независимые генераторы из numpy.random.SeedSequence и распределяются по пулу процессов
+  (процессы запускаются методом POOL_START_METHOD)
+- Ранняя остановка (ключ 'early_stopping'): эмуляции идут порциями, размер выборки
+  закрывается, как только интервал Уилсона для мощности исключает целевую мощность
+- Кеш результатов (аргумент result_cache, PowerResultCache из power_cache.py):
+  уже посчитанные размеры выборки берутся из кеша, эмулируются только недостающие
+  (кроме движков с состоянием: их результат зависит от пути по размерам выборки)
+- Отмена (аргумент cancel_event): расчет прерывается между размерами выборки, порциями
+  и блоками эмуляций (в движке 'loop' - каждые CANCEL_CHECK_EMULATIONS эмуляций),
+  возвращаются уже посчитанные точки (фоновый запуск - background_runner.py)
+- Замеры по фазам (аргументы return_metrics и on_phase_metrics, instrumentation.py): время
+  и число вызовов генерации выборок, применения эффекта и теста по каждому размеру выборки
+- Контрольные точки (аргумент checkpoint, ExperimentCheckpoint из checkpoint.py): каждый
+  завершенный размер выборки дописывается в файл вместе с состоянием генератора и движка,
+  повторный запуск продолжает прерванный расчет с последнего завершенного размера;
+  после успешного завершения файл удаляется
+- Функция run_power_sweep: поверхность мощности по сетке MDE × alpha × размер выборки
+  на общих контрольных выборках; required_sample_sizes сводит её в таблицу
+- Движок 'analytic' в run_experiment: кривая мощности по формуле из analytic_engine.py без эмуляций
+- Функция verify_analytic_sample_size: проверка аналитического ответа эмуляцией
+- Функция iter_sample_moments: моменты множества выборок блоками (бутстрэп средних в DataVisualizations/)
+- Стратегии поиска размера выборки (ключ 'search'):
+    - 'linear': перебор от sample_size с шагом sample_step
+    - 'bisect': галоп с удвоением шага до превышения целевой мощности, затем бисекция
+      до точности search_resolution - O(log диапазона) размеров вместо O(диапазон / шаг)
 
 Взаимодействие с другими модулями:
 1. Принимает дискретное распределение (rv_discrete) из experiments_core.py
+   или быстрый сэмплер DiscreteSampler из discrete_sampler.py
 2. Использует методы статистических тестов из Statistics/stat_test_methods.py
 3. Использует методы добавления эффекта из Statistics/mde_add_methods.py
 4. Принимает конфигурацию из InterfaceWidgets/experiment_config_widgets.py
 5. Возвращает результаты для визуализации в DataVisualizations/
+6. Не зависит от ноутбучных пакетов: прогресс-бар tqdm.notebook импортируется только
+   при progress='notebook', поэтому движок работает и из командной строки (__main__.py)
 
 Пример использования:
     config = {
@@ -26,38 +62,850 @@
         'test_method': 't_test',
         'num_emulations': 1000,
         'sample_size': 1000,
-        'sample_step': 500
+        'sample_step': 500,
+        'engine': 'batch',          # необязательно, по умолчанию 'loop'
+        'search': 'bisect',         # необязательно, по умолчанию 'linear'
+        'search_resolution': 50,    # необязательно, по умолчанию sample_step
+        'max_sample_size': 100000   # необязательно, по умолчанию MAX_SAMPLE_SIZE
     }
     results = run_experiment(rv_discrete, config)
 """
 
+import contextvars
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from functools import partial
+from time import perf_counter
+
 import numpy as np
 import pandas as pd
-from Statistics.stat_test_methods import get_test_method
-from Statistics.mde_add_methods import get_effect_adder
-import ipywidgets as widgets
-from IPython.display import display, clear_output
-from tqdm.auto import tqdm
-from tqdm.notebook import tqdm as tqdm_notebook
+from scipy import stats
+from Statistics.stat_test_methods import get_test_method, get_moment_test_method
+from Statistics.mde_add_methods import get_effect_adder, get_moment_effect_adder
+from ExperimentsCore.discrete_sampler import DiscreteSampler
+from ExperimentsCore.power_cache import make_config_key
+from ExperimentsCore.checkpoint import make_checkpoint_key, rng_state, restore_rng_state
+from ExperimentsCore.instrumentation import (
+    PhaseTimer, ExperimentMetrics, current_phase_timer, use_phase_timer, timed, timed_iter
+)
+from ExperimentsCore.analytic_engine import (
+    MAX_SAMPLE_SIZE, run_analytic_experiment, analytic_required_sample_size, analytic_power_curve
+)
+
+# Бюджет памяти одного блока векторизованных движков в элементах (~40 МБ для float64):
+# включает и выборки, и временные массивы расчета их моментов (см. SAMPLE_BLOCK_FOOTPRINT).
+# При n_jobs > 1 бюджет делится между процессами
+MAX_BLOCK_ELEMENTS = 5_000_000
+
+# Элементов памяти (float64) на одно сгенерированное значение блока выборок: сам блок
+# и временные массивы того же размера - равномерные величины и индексы DiscreteSampler
+# при генерации, отклонения и их квадраты в var (centered и квадраты в движке
+# 'incremental'). Замер tracemalloc: 'batch' при n=10000 - ~128 МБ, если делить бюджет
+# только на размер блока, и ~42 МБ с этим множителем
+SAMPLE_BLOCK_FOOTPRINT = 4
+
+# Стоимость одной категории носителя при мультиномиальной генерации в единицах стоимости
+# одного значения DiscreteSampler (замер на numpy); значение rv_discrete.rvs стоит ~0.07·K
+# таких единиц. Определяет выбор способа генерации приращений в движке 'incremental'
+COUNTS_COST_RATIO = 2.5
+RV_DISCRETE_COST_PER_POINT = 0.07
+
+# Число эмуляций в одной порции при воспроизводимом (seed) и параллельном (n_jobs) расчете
+CHUNK_EMULATIONS = 500
+
+# Способ запуска процессов пула при n_jobs > 1. fork в многопоточном процессе (фоновый
+# запуск из background_runner.py) может зависнуть на унаследованных блокировках, поэтому
+# процессы запускаются заново: каждый импортирует numpy, scipy, pandas и этот модуль, что
+# добавляет несколько секунд к старту пула (пул создается на каждый запуск run_experiment) -
+# n_jobs > 1 окупается только на долгих расчетах
+POOL_START_METHOD = 'spawn'
+
+# Уровень доверия интервала Уилсона для ранней остановки эмуляций
+EARLY_STOPPING_CONFIDENCE = 0.99
+
+# Минимальный размер выборки: дисперсия с ddof=1 делится на sample_size - 1
+MIN_SAMPLE_SIZE = 2
+
+# Период проверки отмены в поштучном движке 'loop' (в эмуляциях)
+CANCEL_CHECK_EMULATIONS = 100
+
+# Период проверки отмены при ожидании порции из пула процессов (в секундах)
+CANCEL_POLL_SECONDS = 0.05
+
+# Проверка отмены текущего запуска run_experiment: движки вызывают её между блоками
+# эмуляций, не меняя сигнатуру (rv_discrete, sample_size, num_emulations, config, random_state)
+_cancel_check = contextvars.ContextVar('cancel_check', default=None)
+
+
+def _raise_if_cancelled():
+    """
+    Прерывает эмуляции, если текущий запуск отменен (без активной проверки ничего не делает).
+    """
+    check_cancelled = _cancel_check.get()
+    if check_cancelled is not None:
+        check_cancelled()
+
+
+@contextmanager
+def _use_cancel_check(check_cancelled):
+    """
+    Делает check_cancelled активной проверкой отмены на время блока with.
+    """
+    token = _cancel_check.set(check_cancelled)
+    try:
+        yield
+    finally:
+        _cancel_check.reset(token)
+
+
+def _count_successes_loop(rv_discrete, sample_size, num_emulations, config, random_state=None):
+    """
+    Проводит эмуляции по одной: генерация выборки, добавление эффекта, тест.
+    
+    Возвращает:
+    int
+        Количество эмуляций со статистически значимым результатом
+    """
+    # Без активного таймера timed возвращает исходные функции
+    timer = current_phase_timer()
+    sample = timed(timer, 'sampling', rv_discrete.rvs)
+    test_function = timed(timer, 'test', get_test_method(config['test_method']))
+    effect_adder = timed(timer, 'effect', get_effect_adder(config['statistic']))
+    
+    successful_tests = 0
+    for emulation in range(num_emulations):
+        if emulation % CANCEL_CHECK_EMULATIONS == 0:
+            _raise_if_cancelled()
+        
+        # Генерация выборок
+        control_sample = sample(size=sample_size, random_state=random_state)
+        experiment_sample = effect_adder(control_sample, config['mde_percent'])
+        
+        # Проведение теста
+        _, is_significant = test_function(control_sample, experiment_sample, config['alpha'])
+        if is_significant:
+            successful_tests += 1
+    
+    return successful_tests
+
+
+def _rvs_block_rows(rv_discrete, row_length, max_block_elements):
+    """
+    Число строк блока для rv_discrete.rvs в пределах бюджета памяти.
+    
+    Каждое значение блока занимает SAMPLE_BLOCK_FOOTPRINT элементов вместе с
+    временными массивами расчета моментов. rv_discrete.rvs, кроме того, сравнивает
+    каждое значение со всеми K точками носителя (промежуточный массив размера × K,
+    освобождается до расчета моментов). DiscreteSampler генерирует значения без
+    промежуточного массива.
+    """
+    footprint = SAMPLE_BLOCK_FOOTPRINT
+    if not isinstance(rv_discrete, DiscreteSampler):
+        footprint = max(footprint, len(rv_discrete.xk))
+    return max(1, max_block_elements // (row_length * footprint))
+
+
+def _prefer_counts(rv_discrete, added_size):
+    """
+    Выбирает способ генерации added_size значений на эмуляцию: частоты над носителем
+    выгоднее, если K категорий мультиномиального распределения дешевле added_size значений.
+    """
+    support_size = len(rv_discrete.xk)
+    if isinstance(rv_discrete, DiscreteSampler):
+        value_cost = 1.0
+    else:
+        value_cost = RV_DISCRETE_COST_PER_POINT * support_size
+    return COUNTS_COST_RATIO * support_size < added_size * value_cost
+
+
+def _iter_moments_batch(rv_discrete, sample_size, num_emulations, max_block_elements, random_state=None):
+    """
+    Генерирует выборки блоками (эмуляции × размер выборки) и отдаёт их моменты.
+    
+    Размер блока (с учетом промежуточного массива rv_discrete.rvs)
+    ограничен max_block_elements, поэтому память не зависит от числа эмуляций.
+    
+    Возвращает (генератор):
+    tuple
+        (means, variances) - массивы по эмуляциям блока, дисперсия с ddof=1
+    """
+    rows_per_block = _rvs_block_rows(rv_discrete, sample_size, max_block_elements)
+    remaining = num_emulations
+    
+    while remaining > 0:
+        _raise_if_cancelled()
+        rows = min(rows_per_block, remaining)
+        block = rv_discrete.rvs(size=(rows, sample_size), random_state=random_state)
+        yield block.mean(axis=1), block.var(axis=1, ddof=1)
+        remaining -= rows
+
+
+def _support(rv_discrete):
+    """
+    Возвращает носитель распределения, нормированные вероятности и среднее.
+    
+    Возвращает:
+    tuple
+        (xk, pk, center) - значения, вероятности и среднее распределения
+    """
+    xk = np.asarray(rv_discrete.xk, dtype=float)
+    pk = np.asarray(rv_discrete.pk, dtype=float)
+    pk = pk / pk.sum()
+    
+    return xk, pk, np.dot(xk, pk)
+
+
+def _validate_sample_size(config):
+    """
+    Проверяет начальный размер выборки: моменты выборки (дисперсия с ddof=1)
+    определены только для sample_size >= MIN_SAMPLE_SIZE.
+    """
+    if config['sample_size'] < MIN_SAMPLE_SIZE:
+        raise ValueError(
+            f"Размер выборки должен быть не меньше {MIN_SAMPLE_SIZE}, получено {config['sample_size']}"
+        )
+
+
+def _validate_test_support(rv_discrete, config, mde_percents):
+    """
+    Проверяет, что распределение подходит для теста из конфигурации.
+    
+    Z-тест пропорций определен только для бинарной метрики (значения 0 и 1),
+    а доля экспериментальной группы p·(1 + MDE) должна оставаться в [0, 1].
+    """
+    if config['test_method'] != 'z_proportion_test':
+        return
+    xk, pk, p = _support(rv_discrete)
+    if not np.all(np.isin(xk[pk > 0], (0, 1))):
+        raise ValueError("Z-тест пропорций требует бинарную метрику со значениями 0 и 1")
+    for mde_percent in mde_percents:
+        if not 0 <= p * (1 + mde_percent / 100) <= 1:
+            raise ValueError(
+                f"Эффект MDE {mde_percent}% выводит долю {p:.4f} за пределы [0, 1] для z-теста пропорций"
+            )
+
+
+def _generator(random_state):
+    """
+    Возвращает генератор для numpy-семплирования: переданный numpy.random.Generator
+    или глобальное состояние numpy (его же использует rv_discrete.rvs по умолчанию).
+    """
+    return np.random if random_state is None else random_state
+
+
+def _moments_from_sums(sum_x, sum_x2, center, sample_size):
+    """
+    Восстанавливает моменты выборок по суммам центрированных значений.
+    
+    Значения центрированы заранее (x - center), чтобы сумма квадратов
+    не теряла точность на больших средних.
+    
+    Возвращает:
+    tuple
+        (means, variances) - массивы по эмуляциям, дисперсия с ddof=1
+    """
+    means = center + sum_x / sample_size
+    variances = (sum_x2 - sum_x ** 2 / sample_size) / (sample_size - 1)
+    
+    return means, np.maximum(variances, 0.0)
+
+
+def _moments_from_counts(counts, xk_centered, center, sample_size):
+    """
+    Восстанавливает моменты выборок по векторам частот над носителем распределения.
+    
+    Возвращает:
+    tuple
+        (means, variances) - массивы по строкам counts, дисперсия с ddof=1
+    """
+    sum_x = counts @ xk_centered
+    sum_x2 = counts @ (xk_centered ** 2)
+    
+    return _moments_from_sums(sum_x, sum_x2, center, sample_size)
+
 
-def run_experiment(rv_discrete, config, on_progress_update=None):
+def _iter_moments_multinomial(rv_discrete, sample_size, num_emulations, max_block_elements, random_state=None):
+    """
+    Генерирует для каждой эмуляции вектор частот длины K над носителем xk
+    (мультиномиальное распределение) вместо sample_size отдельных значений.
+    
+    Стоимость эмуляции зависит от размера носителя K, а не от размера выборки,
+    поэтому режим выгоден при больших выборках и небольшом числе уникальных значений.
+    
+    Возвращает (генератор):
+    tuple
+        (means, variances) - массивы по эмуляциям блока, дисперсия с ddof=1
+    """
+    xk, pk, center = _support(rv_discrete)
+    xk_centered = xk - center
+    generator = _generator(random_state)
+    
+    rows_per_block = max(1, max_block_elements // len(xk))
+    remaining = num_emulations
+    
+    while remaining > 0:
+        _raise_if_cancelled()
+        rows = min(rows_per_block, remaining)
+        counts = generator.multinomial(sample_size, pk, size=rows)
+        yield _moments_from_counts(counts, xk_centered, center, sample_size)
+        remaining -= rows
+
+
+def _iter_moments_binomial(rv_discrete, sample_size, num_emulations, max_block_elements, random_state=None):
+    """
+    Генерирует для бинарной метрики (носитель из двух значений, например конверсия 0/1)
+    число "успехов" каждой эмуляции одним биномиальным значением.
+    
+    Стоимость эмуляции - одно случайное число независимо от размера выборки.
+    
+    Возвращает (генератор):
+    tuple
+        (means, variances) - массивы по эмуляциям блока, дисперсия с ddof=1
+    """
+    xk, pk, _ = _support(rv_discrete)
+    if len(xk) != 2:
+        raise ValueError(f"Биномиальная генерация требует бинарную метрику (два значения в носителе), получено {len(xk)}")
+    low, high = xk
+    spread = high - low
+    generator = _generator(random_state)
+    
+    remaining = num_emulations
+    while remaining > 0:
+        _raise_if_cancelled()
+        rows = min(max_block_elements, remaining)
+        successes = generator.binomial(sample_size, pk[1], size=rows)
+        means = low + spread * successes / sample_size
+        variances = spread ** 2 * successes * (sample_size - successes) / (sample_size * (sample_size - 1))
+        yield means, variances
+        remaining -= rows
+
+
+def _count_successes_from_moments(moments_blocks, sample_size, config):
+    """
+    Применяет эффект и тест к выборочным моментам, поступающим блоками.
+    
+    Возвращает:
+    int
+        Количество эмуляций со статистически значимым результатом
+    """
+    timer = current_phase_timer()
+    moment_test = timed(timer, 'test', get_moment_test_method(config['test_method']))
+    moment_effect_adder = timed(timer, 'effect', get_moment_effect_adder(config['statistic']))
+    
+    successful_tests = 0
+    for mean_c, var_c in moments_blocks:
+        mean_e, var_e = moment_effect_adder(mean_c, var_c, config['mde_percent'])
+        _, is_significant = moment_test(mean_c, var_c, sample_size, mean_e, var_e, sample_size, config['alpha'])
+        successful_tests += int(np.count_nonzero(is_significant))
+    
+    return successful_tests
+
+
+def _count_successes_batch(rv_discrete, sample_size, num_emulations, config, random_state=None):
+    """
+    Проводит все эмуляции одного размера выборки блоками numpy.
+    
+    Эффект и тест применяются к выборочным моментам каждой строки блока,
+    поэтому один размер выборки стоит нескольких операций над массивами.
+    
+    Возвращает:
+    int
+        Количество эмуляций со статистически значимым результатом
+    """
+    max_block_elements = config.get('max_block_elements', MAX_BLOCK_ELEMENTS)
+    moments_blocks = _iter_moments_batch(rv_discrete, sample_size, num_emulations, max_block_elements, random_state)
+    moments_blocks = timed_iter(current_phase_timer(), 'sampling', moments_blocks)
+    
+    return _count_successes_from_moments(moments_blocks, sample_size, config)
+
+
+def _count_successes_multinomial(rv_discrete, sample_size, num_emulations, config, random_state=None):
+    """
+    Проводит все эмуляции одного размера выборки через мультиномиальные частоты
+    над носителем распределения.
+    
+    Возвращает:
+    int
+        Количество эмуляций со статистически значимым результатом
+    """
+    max_block_elements = config.get('max_block_elements', MAX_BLOCK_ELEMENTS)
+    moments_blocks = _iter_moments_multinomial(rv_discrete, sample_size, num_emulations, max_block_elements, random_state)
+    moments_blocks = timed_iter(current_phase_timer(), 'sampling', moments_blocks)
+    
+    return _count_successes_from_moments(moments_blocks, sample_size, config)
+
+
+def _count_successes_binomial(rv_discrete, sample_size, num_emulations, config, random_state=None):
+    """
+    Проводит все эмуляции одного размера выборки бинарной метрики через
+    биномиальное число успехов.
+    
+    Возвращает:
+    int
+        Количество эмуляций со статистически значимым результатом
+    """
+    max_block_elements = config.get('max_block_elements', MAX_BLOCK_ELEMENTS)
+    moments_blocks = _iter_moments_binomial(rv_discrete, sample_size, num_emulations, max_block_elements, random_state)
+    moments_blocks = timed_iter(current_phase_timer(), 'sampling', moments_blocks)
+    
+    return _count_successes_from_moments(moments_blocks, sample_size, config)
+
+
+class _IncrementalEngine:
+    """
+    Движок с общими случайными числами для всех размеров выборки.
+    
+    Для каждой эмуляции хранятся суммы центрированных значений и их квадратов
+    на уже посещенных размерах выборки. Выборка размера n продолжает выборку
+    ближайшего меньшего посещенного размера: генерируются только недостающие
+    значения (частотами над носителем, если это дешевле, иначе напрямую).
+    Кривая мощности при этом получается гладкой и почти монотонной.
+    
+    Хранятся суммы только для ближайших к последнему запрошенному размеров
+    (меньший, он сам и больший): линейный перебор продолжает последний размер,
+    а бисекция - одну из границ текущего интервала, которые всегда соседние
+    с последним посещенным размером. Память не растет с числом размеров.
+    
+    state_arrays / restore_state сохраняют и восстанавливают суммы для
+    контрольных точек (checkpoint.py): продолжение прерванного расчета дает те же
+    числа, что и непрерывный расчет.
+    
+    Экземпляр хранит состояние одного запуска и создается в run_experiment заново.
+    """
+    
+    def __init__(self):
+        self.num_emulations = None
+        self.checkpoints = {}  # sample_size -> (sum_x, sum_x2)
+    
+    def _extend(self, rv_discrete, sums, added_size, max_block_elements, random_state):
+        """Дописывает added_size новых значений к каждой эмуляции."""
+        xk, pk, center = _support(rv_discrete)
+        xk_centered = xk - center
+        sum_x, sum_x2 = sums[0].copy(), sums[1].copy()
+        generator = _generator(random_state)
+        
+        use_counts = _prefer_counts(rv_discrete, added_size)
+        if use_counts:
+            rows_per_block = max(1, max_block_elements // len(xk))
+        else:
+            rows_per_block = _rvs_block_rows(rv_discrete, added_size, max_block_elements)
+        
+        for start in range(0, self.num_emulations, rows_per_block):
+            _raise_if_cancelled()
+            rows = slice(start, min(start + rows_per_block, self.num_emulations))
+            size = rows.stop - rows.start
+            if use_counts:
+                counts = generator.multinomial(added_size, pk, size=size)
+                sum_x[rows] += counts @ xk_centered
+                sum_x2[rows] += counts @ (xk_centered ** 2)
+            else:
+                block = rv_discrete.rvs(size=(size, added_size), random_state=random_state) - center
+                sum_x[rows] += block.sum(axis=1)
+                sum_x2[rows] += (block ** 2).sum(axis=1)
+        
+        return sum_x, sum_x2
+    
+    def _prune(self, sample_size):
+        """Оставляет суммы только для sample_size и соседних с ним посещенных размеров."""
+        sizes = sorted(self.checkpoints)
+        position = sizes.index(sample_size)
+        keep = sizes[max(0, position - 1):position + 2]
+        self.checkpoints = {size: self.checkpoints[size] for size in keep}
+    
+    def state_arrays(self):
+        """Накопленные суммы в виде словаря массивов (для сохранения в контрольной точке)."""
+        sizes = sorted(self.checkpoints)
+        return {
+            'num_emulations': np.array(self.num_emulations if self.num_emulations is not None else -1),
+            'sizes': np.array(sizes, dtype=np.int64),
+            'sum_x': np.array([self.checkpoints[size][0] for size in sizes]),
+            'sum_x2': np.array([self.checkpoints[size][1] for size in sizes])
+        }
+    
+    def restore_state(self, arrays):
+        """Восстанавливает суммы, сохраненные state_arrays."""
+        num_emulations = int(arrays['num_emulations'])
+        self.num_emulations = num_emulations if num_emulations >= 0 else None
+        self.checkpoints = {
+            int(size): (sum_x, sum_x2)
+            for size, sum_x, sum_x2 in zip(arrays['sizes'], arrays['sum_x'], arrays['sum_x2'])
+        }
+    
+    def __call__(self, rv_discrete, sample_size, num_emulations, config, random_state=None):
+        # Смена числа эмуляций делает накопленное состояние непригодным
+        if num_emulations != self.num_emulations:
+            self.num_emulations = num_emulations
+            self.checkpoints = {}
+        
+        # Ближайший меньший посещенный размер (или пустая выборка)
+        base_size = max((size for size in self.checkpoints if size <= sample_size), default=0)
+        if base_size:
+            base_sums = self.checkpoints[base_size]
+        else:
+            base_sums = (np.zeros(num_emulations), np.zeros(num_emulations))
+        
+        if base_size == sample_size:
+            sums = base_sums
+        else:
+            max_block_elements = config.get('max_block_elements', MAX_BLOCK_ELEMENTS)
+            extend = timed(current_phase_timer(), 'sampling', self._extend)
+            sums = extend(rv_discrete, base_sums, sample_size - base_size, max_block_elements, random_state)
+            self.checkpoints[sample_size] = sums
+        self._prune(sample_size)
+        
+        center = _support(rv_discrete)[2]
+        moments = _moments_from_sums(sums[0], sums[1], center, sample_size)
+        
+        return _count_successes_from_moments([moments], sample_size, config)
+
+
+# Словарь доступных движков эмуляции
+engines = {
+    'loop': _count_successes_loop,
+    'batch': _count_successes_batch,
+    'multinomial': _count_successes_multinomial,
+    'binomial': _count_successes_binomial,
+}
+
+# Движки с состоянием между размерами выборки: создаются заново на каждый запуск
+stateful_engines = {
+    'incremental': _IncrementalEngine,
+}
+
+
+def _get_engine(engine):
+    """
+    Возвращает функцию проведения эмуляций
+    (rv_discrete, sample_size, num_emulations, config, random_state=None) -> int.
+    """
+    if engine in stateful_engines:
+        return stateful_engines[engine]()
+    if engine in engines:
+        return engines[engine]
+    raise ValueError(f"Неизвестный движок эмуляции: '{engine}'")
+
+
+def _count_successes_chunk(engine, rv_discrete, sample_size, num_emulations, config, seed_sequence, instrument=False):
+    """
+    Проводит одну порцию эмуляций на собственном генераторе.
+    Функция верхнего уровня, чтобы её можно было передать в процесс-воркер.
+    С instrument=True возвращает (число успехов, замеры фаз) - таймер
+    родительского процесса в воркер не передается.
+    """
+    random_state = np.random.default_rng(seed_sequence)
+    if not instrument:
+        return engines[engine](rv_discrete, sample_size, num_emulations, config, random_state)
+    
+    with use_phase_timer(PhaseTimer()) as timer:
+        successful_tests = engines[engine](rv_discrete, sample_size, num_emulations, config, random_state)
+    return successful_tests, timer.snapshot()
+
+
+def _split_emulations(num_emulations, chunk_emulations):
+    """
+    Делит эмуляции на порции фиксированного размера (последняя - остаток).
+    """
+    return [min(chunk_emulations, num_emulations - start) for start in range(0, num_emulations, chunk_emulations)]
+
+
+def _seeded_engine(engine, seed, chunk_emulations, executor=None, check_cancelled=None):
+    """
+    Оборачивает движок без состояния в воспроизводимый (и, при наличии executor, параллельный) вариант.
+    
+    Эмуляции одного размера выборки делятся на порции фиксированного размера,
+    каждая порция получает свой генератор из SeedSequence(seed, spawn_key=(sample_size, номер
+    первой эмуляции порции)). Разбиение не зависит от числа воркеров, поэтому один и тот же
+    seed дает одинаковую мощность при любом n_jobs и любом порядке посещения размеров выборки.
+    check_cancelled (если задана) вызывается перед каждой порцией, а при параллельном
+    расчете - каждые CANCEL_POLL_SECONDS во время ожидания порции.
+    
+    Возвращает:
+    function
+        Функция (rv_discrete, sample_size, num_emulations, config, first_emulation=0) -> int,
+        first_emulation - номер первой эмуляции (для продолжения уже начатого размера выборки)
+    """
+    def count_successes(rv_discrete, sample_size, num_emulations, config, first_emulation=0):
+        chunks = _split_emulations(num_emulations, chunk_emulations)
+        chunk_starts = first_emulation + np.cumsum([0] + chunks[:-1])
+        seed_sequences = [
+            np.random.SeedSequence(seed, spawn_key=(sample_size, int(start)))
+            for start in chunk_starts
+        ]
+        
+        if executor is None:
+            successful_tests = 0
+            for chunk, seed_sequence in zip(chunks, seed_sequences):
+                if check_cancelled is not None:
+                    check_cancelled()
+                successful_tests += _count_successes_chunk(engine, rv_discrete, sample_size, chunk, config, seed_sequence)
+            return successful_tests
+        
+        timer = current_phase_timer()
+        futures = [
+            executor.submit(_count_successes_chunk, engine, rv_discrete, sample_size, chunk, config, seed_sequence,
+                            timer is not None)
+            for chunk, seed_sequence in zip(chunks, seed_sequences)
+        ]
+        # Невыполненные порции отменяются в run_experiment при закрытии пула
+        successful_tests = 0
+        for future in futures:
+            if check_cancelled is not None:
+                while not wait([future], timeout=CANCEL_POLL_SECONDS).done:
+                    check_cancelled()
+            if timer is None:
+                successful_tests += future.result()
+            else:
+                chunk_successes, snapshot = future.result()
+                successful_tests += chunk_successes
+                timer.merge(snapshot)
+        return successful_tests
+    
+    return count_successes
+
+
+def _wilson_interval(successes, trials, confidence):
+    """
+    Доверительный интервал Уилсона для доли успехов.
+    
+    Возвращает:
+    tuple
+        (lower, upper) - границы интервала для мощности
+    """
+    z = stats.norm.ppf(1 - (1 - confidence) / 2)
+    share = successes / trials
+    denominator = 1 + z ** 2 / trials
+    center = (share + z ** 2 / (2 * trials)) / denominator
+    half_width = z * np.sqrt(share * (1 - share) / trials + z ** 2 / (4 * trials ** 2)) / denominator
+    
+    return center - half_width, center + half_width
+
+
+def _count_successes_sequential(count_batch, num_emulations, batch_emulations, target_power, confidence):
+    """
+    Проводит эмуляции одного размера выборки порциями и останавливается, как только
+    доверительный интервал Уилсона для мощности не содержит целевую мощность.
+    Полный бюджет num_emulations тратится только вблизи точки пересечения.
+    
+    Параметры:
+    count_batch : callable
+        Функция (first_emulation, num_emulations) -> число значимых результатов
+    num_emulations : int
+        Максимальное число эмуляций
+    batch_emulations : int
+        Размер порции между проверками
+    target_power : float
+        Целевая мощность
+    confidence : float
+        Уровень доверия интервала (выше уровень - реже ошибочная остановка
+        из-за многократных проверок)
+        
+    Возвращает:
+    tuple
+        (successful_tests, used_emulations)
+    """
+    successful_tests = 0
+    used_emulations = 0
+    
+    while used_emulations < num_emulations:
+        batch = min(batch_emulations, num_emulations - used_emulations)
+        successful_tests += count_batch(used_emulations, batch)
+        used_emulations += batch
+        
+        lower, upper = _wilson_interval(successful_tests, used_emulations, confidence)
+        if upper < target_power or lower > target_power:
+            break
+    
+    return successful_tests, used_emulations
+
+
+def _resolve_n_jobs(n_jobs):
+    """
+    Приводит n_jobs к числу процессов: None или 1 - без пула, -1 - все ядра.
+    """
+    if n_jobs is None:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return max(1, n_jobs)
+
+
+def _estimate_bisect_iterations(sample_size, sample_step, max_sample_size, resolution):
+    """
+    Оценивает сверху число размеров выборки, которые посетит поиск 'bisect'.
+    """
+    span = max(max_sample_size - sample_size, 1)
+    gallop_steps = int(np.ceil(np.log2(span / sample_step + 1))) + 1
+    bisect_steps = int(np.ceil(np.log2(max(span / resolution, 1))))
+    return gallop_steps + bisect_steps
+
+
+def _search_linear(evaluate, sample_size, sample_step, max_sample_size, target_power, resolution):
+    """
+    Перебирает размеры выборки с постоянным шагом до достижения целевой мощности.
+    Точность определяется шагом, resolution не используется.
+    """
+    current_size = sample_size
+    while current_size <= max_sample_size:
+        if evaluate(current_size) >= target_power:
+            break
+        current_size += sample_step
+
+
+def _search_bisect(evaluate, sample_size, sample_step, max_sample_size, target_power, resolution):
+    """
+    Галопом (шаг удваивается) находит интервал, где мощность пересекает цель,
+    затем сужает его бисекцией до ширины resolution.
+    Опирается на монотонный рост мощности с размером выборки.
+    """
+    # Стартовый размер уже за верхней границей - оценивать нечего, как и в линейном переборе
+    if sample_size > max_sample_size:
+        return
+    
+    # Галоп: lower - наибольший размер без нужной мощности, upper - первый с ней
+    lower, upper = None, None
+    current_size, step = sample_size, sample_step
+    while True:
+        if evaluate(current_size) >= target_power:
+            upper = current_size
+            break
+        lower = current_size
+        if current_size >= max_sample_size:
+            break
+        current_size = min(current_size + step, max_sample_size)
+        step *= 2
+    
+    # Цель не достигнута или достигнута уже на стартовом размере
+    if lower is None or upper is None:
+        return
+    
+    # Бисекция внутри найденного интервала
+    while upper - lower > resolution:
+        middle = (lower + upper) // 2
+        if evaluate(middle) >= target_power:
+            upper = middle
+        else:
+            lower = middle
+
+
+# Словарь доступных стратегий поиска размера выборки
+search_strategies = {
+    'linear': _search_linear,
+    'bisect': _search_bisect,
+}
+
+
+class _NullProgress:
+    """
+    Прогресс-бар, который ничего не выводит (для пакетных запусков).
+    """
+    
+    def set_postfix(self, *args, **kwargs):
+        pass
+    
+    def update(self, n=1):
+        pass
+    
+    def close(self):
+        pass
+
+
+def _create_progress_bar(progress, total, desc):
+    """
+    Создает прогресс-бар по имени: 'notebook' - виджет tqdm.notebook,
+    'text' - текстовый tqdm в stderr, 'none' - без вывода.
+    Пакеты tqdm импортируются только при необходимости.
+    """
+    if progress == 'notebook':
+        from tqdm.notebook import tqdm as tqdm_notebook
+        return tqdm_notebook(total=total, desc=desc, leave=True)
+    if progress == 'text':
+        from tqdm import tqdm
+        return tqdm(total=total, desc=desc, leave=True)
+    if progress == 'none':
+        return _NullProgress()
+    raise ValueError(f"Неизвестный вид прогресс-бара: '{progress}'")
+
+
+def _cached_point_usable(cached, num_emulations, early_stopping, target_power, confidence):
+    """
+    Проверяет, можно ли взять точку из кеша вместо эмуляций.
+    
+    Точка с полным числом эмуляций подходит всегда. Точка, закрытая ранней
+    остановкой, подходит только при ранней остановке и только если её интервал
+    Уилсона исключает текущую целевую мощность.
+    """
+    power, emulations = cached
+    if emulations >= num_emulations:
+        return True
+    if not early_stopping:
+        return False
+    lower, upper = _wilson_interval(power * emulations, emulations, confidence)
+    return upper < target_power or lower > target_power
+
+
+class _ExperimentCancelled(Exception):
+    """
+    Прерывание поиска размера выборки по событию отмены.
+    """
+
+
+def run_experiment(rv_discrete, config, on_progress_update=None, result_cache=None, progress='notebook',
+                   cancel_event=None, checkpoint=None, return_metrics=False, on_phase_metrics=None):
     """
     Запускает эксперимент по определению минимального размера выборки.
     
     Параметры:
-    rv_discrete : scipy.stats.rv_discrete
+    rv_discrete : scipy.stats.rv_discrete или DiscreteSampler
         Дискретное распределение для генерации выборок
     config : dict
-        Конфигурация эксперимента
+        Конфигурация эксперимента. Необязательный ключ 'engine' выбирает
+        движок эмуляции из словарей engines и stateful_engines (по умолчанию 'loop')
+        или 'analytic' для расчета мощности по формуле без эмуляций.
+        Необязательный ключ 'search' выбирает стратегию поиска ('linear' или 'bisect'),
+        'search_resolution' - точность бисекции, 'max_sample_size' - верхнюю границу.
+        'seed' делает результат воспроизводимым, 'n_jobs' распределяет порции
+        эмуляций ('chunk_emulations', по умолчанию CHUNK_EMULATIONS) по пулу процессов
+        (запуск пула методом POOL_START_METHOD стоит несколько секунд).
+        'early_stopping' включает раннюю остановку с проверкой каждые
+        'early_stopping_batch' эмуляций (по умолчанию chunk_emulations) на уровне
+        доверия 'early_stopping_confidence' (по умолчанию EARLY_STOPPING_CONFIDENCE).
     on_progress_update : callable, optional
         Функция обратного вызова для обновления прогресса.
         Принимает параметры: (current_size, power, target_power, iteration, total_iterations)
+    result_cache : PowerResultCache, optional
+        Кеш мощности по размерам выборки: найденные точки не эмулируются заново,
+        новые точки сохраняются. Движки с состоянием (stateful_engines) кеш не
+        используют: их мощность на размере n зависит от посещенных до него размеров
+        (sample_size, sample_step, search), которых нет в ключе кеша.
+    progress : str
+        Прогресс-бар: 'notebook' (по умолчанию), 'text' или 'none'
+    cancel_event : threading.Event, optional
+        Событие отмены (см. background_runner.py): проверяется перед каждым размером
+        выборки, между порциями и блоками эмуляций (в движке 'loop' - каждые
+        CANCEL_CHECK_EMULATIONS эмуляций); после отмены возвращаются уже посчитанные точки
+    checkpoint : ExperimentCheckpoint, optional
+        Файл контрольных точек: завершенные размеры выборки дописываются в него
+        вместе с состоянием генератора и движка; при той же конфигурации и тех же
+        данных прерванный расчет продолжается с последнего завершенного размера без
+        повторных эмуляций. После успешного завершения файл удаляется
+    return_metrics : bool
+        Включает замеры времени по фазам (генерация, эффект, тест; см. instrumentation.py)
+        и возвращает их вместе с результатами
+    on_phase_metrics : callable, optional
+        Включает замеры и вызывается после каждого размера выборки с его записью
+        (sample_size, seconds, emulations, source, phases)
         
     Возвращает:
     pd.DataFrame
         Результаты эксперимента с колонками:
         - sample_size: размер выборки
         - power: достигнутая мощность
+        - emulations: число проведенных эмуляций (0 для аналитического расчета)
+        Атрибут df_results.attrs['cancelled'] равен True, если расчет был отменен.
+    tuple
+        (df_results, ExperimentMetrics), если return_metrics=True
     """
     alpha = config['alpha']
     target_power = config['target_power']
@@ -67,74 +915,383 @@ def run_experiment(rv_discrete, config, on_progress_update=None):
     num_emulations = config['num_emulations']
     sample_size = config['sample_size']
     sample_step = config['sample_step']
-
+    engine = config.get('engine', 'loop')
+    search = config.get('search', 'linear')
+    
     # Максимальный размер выборки
-    max_sample_size = 100000
+    max_sample_size = config.get('max_sample_size', MAX_SAMPLE_SIZE)
+    
+    # Замеры по фазам (без них движки работают с исходными функциями фаз)
+    metrics = ExperimentMetrics()
+    timer = PhaseTimer() if return_metrics or on_phase_metrics else None
+    
+    _validate_sample_size(config)
+    _validate_test_support(rv_discrete, config, [mde_percent])
+    
+    # Аналитический расчет не требует эмуляций
+    if engine == 'analytic':
+        df_results = run_analytic_experiment(rv_discrete, config, max_sample_size)
+        df_results['emulations'] = 0
+        if on_progress_update:
+            for iteration, row in enumerate(df_results.itertuples(index=False), start=1):
+                on_progress_update(row.sample_size, row.power, target_power, iteration, len(df_results))
+        df_results.attrs['cancelled'] = False
+        return (df_results, metrics) if return_metrics else df_results
+    
+    def check_cancelled():
+        if cancel_event is not None and cancel_event.is_set():
+            raise _ExperimentCancelled()
     
     # Подготовка структуры для результатов
-    results = {}  # sample_size -> power
+    results = {}  # sample_size -> (power, emulations)
     
-    # Получаем функции для теста и добавления эффекта
-    test_function = get_test_method(test_method)
-    effect_adder = get_effect_adder(statistic)
+    # Получаем функцию проведения эмуляций для выбранного движка
+    count_successes = _get_engine(engine)
+    
+    seed = config.get('seed')
+    n_jobs = _resolve_n_jobs(config.get('n_jobs', 1))
+    early_stopping = config.get('early_stopping', False)
+    chunk_emulations = config.get('chunk_emulations', CHUNK_EMULATIONS)
+    early_stopping_confidence = config.get('early_stopping_confidence', EARLY_STOPPING_CONFIDENCE)
+    if engine in stateful_engines:
+        # Точка движка с состоянием зависит от пути по размерам выборки - кешировать нельзя
+        result_cache = None
+    if result_cache is not None:
+        # Значения по умолчанию подставляются явно: их пропуск и явное указание дают один ключ
+        config_key = make_config_key(rv_discrete, dict(config, engine=engine, chunk_emulations=chunk_emulations))
+    else:
+        config_key = None
+    executor = None
+    engine_config = config
+    
+    # Контрольные точки прерванного запуска с той же конфигурацией и теми же данными
+    checkpoint_key = make_checkpoint_key(rv_discrete, config) if checkpoint is not None else None
+    resumed = checkpoint.load(checkpoint_key) if checkpoint is not None else None
+    checkpoint_points = resumed['points'] if resumed is not None else {}
+    if resumed is not None and seed is None:
+        # Сгенерированный в прерванном запуске seed - продолжение дает те же числа
+        seed = resumed['seed']
+    
+    # Движок с состоянием и его генератор: их состояние сохраняется в контрольных точках;
+    # порциям эмуляций с собственными генераторами достаточно seed из заголовка файла
+    stateful_engine = None
+    generator = None
+    if engine in stateful_engines:
+        # Движок с состоянием ведет эмуляции последовательно на одном локальном генераторе
+        # (глобальный numpy.random не используется - запуск может идти в фоновом потоке)
+        if n_jobs > 1:
+            raise ValueError(f"Движок '{engine}' не поддерживает параллельный расчет (n_jobs > 1)")
+        if early_stopping:
+            raise ValueError(f"Движок '{engine}' не поддерживает раннюю остановку эмуляций")
+        stateful_engine = count_successes
+        generator = np.random.default_rng(seed)
+        count_successes = partial(count_successes, random_state=generator)
+    elif seed is not None or n_jobs > 1 or early_stopping or checkpoint is not None:
+        # Порции эмуляций с собственными генераторами: воспроизводимо, параллельно,
+        # с возможностью продолжить начатый размер выборки при ранней остановке
+        # и продолжить прерванный расчет по seed из контрольных точек
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        if n_jobs > 1:
+            executor = ProcessPoolExecutor(max_workers=n_jobs, mp_context=multiprocessing.get_context(POOL_START_METHOD))
+        count_successes = _seeded_engine(engine, seed, chunk_emulations, executor, check_cancelled)
+        # Бюджет памяти блока делится между процессами пула
+        engine_config = dict(config, max_block_elements=max(1, config.get('max_block_elements', MAX_BLOCK_ELEMENTS) // n_jobs))
+    
+    if checkpoint is not None:
+        if resumed is None:
+            checkpoint.start(checkpoint_key, seed)
+        elif generator is not None and resumed['rng_state'] is not None:
+            # Генератор и движок продолжают с состояния после последнего завершенного размера
+            restore_rng_state(resumed['rng_state'], generator)
+            if resumed['engine_state'] is not None:
+                stateful_engine.restore_state(resumed['engine_state'])
+    
+    if search not in search_strategies:
+        raise ValueError(f"Неизвестная стратегия поиска: '{search}'")
+    resolution = max(1, config.get('search_resolution', sample_step))
     
     # Оценка количества итераций для tqdm
-    max_iterations = (max_sample_size - sample_size) // sample_step + 1
+    if search == 'bisect':
+        max_iterations = _estimate_bisect_iterations(sample_size, sample_step, max_sample_size, resolution)
+    else:
+        max_iterations = (max_sample_size - sample_size) // sample_step + 1
     
     # Создаем прогресс-бар tqdm для внешнего цикла
-    pbar = tqdm_notebook(
-        total=max_iterations, 
-        desc=f"Поиск размера выборки (MDE: {mde_percent}%, мощность: {target_power})",
-        leave=True
+    pbar = _create_progress_bar(
+        progress,
+        total=max_iterations,
+        desc=f"Поиск размера выборки (MDE: {mde_percent}%, мощность: {target_power})"
     )
     
-    # Внешний цикл - увеличение размера выборки
-    current_size = sample_size
-    sample_count = 0
+    def evaluate(current_size):
+        """Оценивает мощность для одного размера выборки и сообщает о прогрессе."""
+        check_cancelled()
+        start = perf_counter()
+        if timer is not None:
+            timer.reset()
+        source = 'emulation'
+        cached = result_cache.get(config_key, current_size) if result_cache is not None else None
+        if current_size in checkpoint_points:
+            # Размер выборки завершен в прерванном запуске
+            cached = checkpoint_points[current_size]
+        
+        # Эмуляции для текущего размера (если точки нет в кеше или контрольных точках)
+        if current_size in checkpoint_points or (
+                cached is not None and _cached_point_usable(cached, num_emulations, early_stopping,
+                                                            target_power, early_stopping_confidence)):
+            power, used_emulations = cached
+            successful_tests = round(power * used_emulations)
+            source = 'checkpoint' if current_size in checkpoint_points else 'cache'
+        elif early_stopping:
+            def count_batch(first, count):
+                check_cancelled()
+                return count_successes(rv_discrete, current_size, count, engine_config, first)
+            
+            successful_tests, used_emulations = _count_successes_sequential(
+                count_batch,
+                num_emulations,
+                config.get('early_stopping_batch', chunk_emulations),
+                target_power,
+                early_stopping_confidence
+            )
+        else:
+            successful_tests = count_successes(rv_discrete, current_size, num_emulations, engine_config)
+            used_emulations = num_emulations
+        
+        # Расчет мощности для текущего размера
+        power = successful_tests / used_emulations
+        results[current_size] = (power, used_emulations)
+        # Сохраняем новую точку или уточняем точку, закрытую ранней остановкой
+        if result_cache is not None and (cached is None or cached[1] < used_emulations):
+            result_cache.put(config_key, current_size, power, used_emulations)
+        if checkpoint is not None and current_size not in checkpoint_points:
+            if stateful_engine is not None:
+                checkpoint.append(checkpoint_key, current_size, power, used_emulations,
+                                  rng_state(generator), stateful_engine.state_arrays())
+            else:
+                checkpoint.append(checkpoint_key, current_size, power, used_emulations)
+        
+        if timer is not None:
+            record = metrics.record(current_size, perf_counter() - start, used_emulations, source, timer.snapshot())
+            if on_phase_metrics:
+                on_phase_metrics(record)
+        
+        # Обновляем прогресс через callback, если он предоставлен
+        if on_progress_update:
+            on_progress_update(current_size, power, target_power, len(results), max_iterations)
+        
+        # Обновляем прогресс-бар с информацией о текущем размере и мощности
+        pbar.set_postfix({"выборка": current_size, "мощность": f"{power:.3f}", "эмуляций": used_emulations})
+        pbar.update(1)
+        
+        return power
     
+    cancelled = False
     try:
-        while current_size <= max_sample_size:
-            # Внутренний цикл - эмуляции для текущего размера
-            successful_tests = 0
-            
-            # Выполняем эмуляции
-            for _ in range(num_emulations):
-                # Генерация выборок
-                control_sample = rv_discrete.rvs(size=current_size)
-                experiment_sample = effect_adder(control_sample, mde_percent)
-                
-                # Проведение теста
-                _, is_significant = test_function(control_sample, experiment_sample, alpha)
-                if is_significant:
-                    successful_tests += 1
-            
-            # Расчет мощности для текущего размера
-            power = successful_tests / num_emulations
-            results[current_size] = power
-            
-            # Обновляем прогресс через callback, если он предоставлен
-            sample_count += 1
-            if on_progress_update:
-                on_progress_update(current_size, power, target_power, sample_count, max_iterations)
-            
-            # Обновляем прогресс-бар с информацией о текущем размере и мощности
-            pbar.set_postfix({"выборка": current_size, "мощность": f"{power:.3f}"})
-            pbar.update(1)
-            
-            # Проверка достижения целевой мощности
-            if power >= target_power:
-                break
-                
-            # Увеличение размера выборки
-            current_size += sample_step
+        with use_phase_timer(timer), _use_cancel_check(check_cancelled if cancel_event is not None else None):
+            search_strategies[search](evaluate, sample_size, sample_step, max_sample_size, target_power, resolution)
+    except _ExperimentCancelled:
+        # Отмена: возвращаем точки, посчитанные до нее
+        cancelled = True
     finally:
-        # Всегда закрываем прогресс-бар при завершении
+        # Всегда закрываем прогресс-бар и пул процессов при завершении
         pbar.close()
+        if executor is not None:
+            # После отмены не ждем порции, уже выполняющиеся в воркерах
+            executor.shutdown(wait=not cancelled, cancel_futures=True)
+    
+    if checkpoint is not None and not cancelled:
+        # Расчет завершен - продолжать нечего, файл не должен подменять новый расчет
+        checkpoint.clear()
     
     # Создание DataFrame из результатов
+    sample_sizes = sorted(results)
     df_results = pd.DataFrame({
-        'sample_size': list(results.keys()),
-        'power': list(results.values())
+        'sample_size': sample_sizes,
+        'power': [results[size][0] for size in sample_sizes],
+        'emulations': [results[size][1] for size in sample_sizes]
     })
+    df_results.attrs['cancelled'] = cancelled
+    
+    return (df_results, metrics) if return_metrics else df_results
+
+
+# Генераторы выборочных моментов, пригодные для общей контрольной группы в run_power_sweep
+moment_iterators = {
+    'batch': _iter_moments_batch,
+    'multinomial': _iter_moments_multinomial,
+    'binomial': _iter_moments_binomial,
+}
+
+
+def iter_sample_moments(rv_discrete, sample_size, num_samples, max_block_elements=MAX_BLOCK_ELEMENTS, random_state=None):
+    """
+    Генерирует моменты num_samples выборок размера sample_size блоками под бюджет памяти.
+    Способ генерации (значения или частоты над носителем) выбирается по стоимости.
+    
+    Параметры:
+    rv_discrete : scipy.stats.rv_discrete или DiscreteSampler
+        Дискретное распределение
+    sample_size : int
+        Размер каждой выборки
+    num_samples : int
+        Количество выборок
+    max_block_elements : int
+        Максимальное число элементов в одном блоке
+    random_state : numpy.random.Generator, optional
+        Источник случайности (None - глобальное состояние numpy)
+    
+    Возвращает (генератор):
+    tuple
+        (means, variances) - массивы по выборкам блока, дисперсия с ddof=1
+    """
+    iterator_name = 'multinomial' if _prefer_counts(rv_discrete, sample_size) else 'batch'
+    yield from moment_iterators[iterator_name](rv_discrete, sample_size, num_samples, max_block_elements, random_state)
+
+
+def run_power_sweep(rv_discrete, config, mde_percents, alphas=None, on_progress_update=None):
+    """
+    Строит поверхность мощности по сетке MDE (и, при необходимости, alpha) × размер выборки.
+    
+    Для каждого размера выборки контрольные выборки генерируются один раз,
+    их моменты переиспользуются для всех эффектов и уровней значимости,
+    поэтому дополнительный MDE стоит только применения эффекта и теста к массивам.
+    Размеры выборки перебираются от sample_size с шагом sample_step, пока каждая
+    комбинация не достигнет target_power (или до max_sample_size).
+    
+    Параметры:
+    rv_discrete : scipy.stats.rv_discrete или DiscreteSampler
+        Дискретное распределение для генерации выборок
+    config : dict
+        Конфигурация эксперимента (как у run_experiment). 'engine' - 'batch' или
+        'multinomial' (по умолчанию 'multinomial'), 'seed' делает результат воспроизводимым.
+    mde_percents : list
+        Значения MDE в процентах
+    alphas : list, optional
+        Уровни значимости (по умолчанию [config['alpha']])
+    on_progress_update : callable, optional
+        Функция обратного вызова (current_size, power, target_power, iteration, total_iterations),
+        power - минимальная мощность среди еще не достигших цели комбинаций
+        
+    Возвращает:
+    pd.DataFrame
+        Колонки mde_percent, alpha, sample_size, power, emulations - по строке на
+        каждую комбинацию и размер выборки до достижения ею target_power
+    """
+    engine = config.get('engine', 'multinomial')
+    if engine not in moment_iterators:
+        raise ValueError(f"Движок '{engine}' не поддерживает общую контрольную группу, используйте {list(moment_iterators)}")
+    iter_moments = moment_iterators[engine]
+    
+    alphas = [config['alpha']] if alphas is None else list(alphas)
+    target_power = config['target_power']
+    num_emulations = config['num_emulations']
+    sample_step = config['sample_step']
+    max_sample_size = config.get('max_sample_size', MAX_SAMPLE_SIZE)
+    max_block_elements = config.get('max_block_elements', MAX_BLOCK_ELEMENTS)
+    seed = config.get('seed')
+    
+    moment_test = get_moment_test_method(config['test_method'])
+    moment_effect_adder = get_moment_effect_adder(config['statistic'])
+    _validate_sample_size(config)
+    _validate_test_support(rv_discrete, config, mde_percents)
+    
+    # Комбинации, еще не достигшие целевой мощности
+    pending = [(mde_percent, alpha) for mde_percent in mde_percents for alpha in alphas]
+    rows = []
+    
+    max_iterations = (max_sample_size - config['sample_size']) // sample_step + 1
+    current_size = config['sample_size']
+    iteration = 0
+    
+    while pending and current_size <= max_sample_size:
+        random_state = None
+        if seed is not None:
+            random_state = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(current_size,)))
+        
+        # Контрольные моменты одного размера выборки - общие для всех комбинаций
+        moments = list(iter_moments(rv_discrete, current_size, num_emulations, max_block_elements, random_state))
+        mean_c = np.concatenate([block[0] for block in moments])
+        var_c = np.concatenate([block[1] for block in moments])
+        
+        still_pending = []
+        for mde_percent, alpha in pending:
+            mean_e, var_e = moment_effect_adder(mean_c, var_c, mde_percent)
+            _, is_significant = moment_test(mean_c, var_c, current_size, mean_e, var_e, current_size, alpha)
+            power = np.count_nonzero(is_significant) / num_emulations
+            
+            rows.append({
+                'mde_percent': mde_percent,
+                'alpha': alpha,
+                'sample_size': current_size,
+                'power': power,
+                'emulations': num_emulations
+            })
+            if power < target_power:
+                still_pending.append((mde_percent, alpha))
+        
+        iteration += 1
+        if on_progress_update:
+            lowest_power = min((row['power'] for row in rows[-len(pending):]), default=target_power)
+            on_progress_update(current_size, lowest_power, target_power, iteration, max_iterations)
+        
+        pending = still_pending
+        current_size += sample_step
+    
+    return pd.DataFrame(rows, columns=['mde_percent', 'alpha', 'sample_size', 'power', 'emulations'])
+
+
+def required_sample_sizes(surface, target_power):
+    """
+    Сводит поверхность мощности в таблицу минимальных размеров выборки.
     
-    return df_results
+    Параметры:
+    surface : pd.DataFrame
+        Результат run_power_sweep
+    target_power : float
+        Целевая мощность
+        
+    Возвращает:
+    pd.DataFrame
+        Строки - mde_percent, колонки - alpha, значения - минимальный размер выборки
+        с мощностью не ниже целевой (NaN, если не достигнута)
+    """
+    reached = surface[surface['power'] >= target_power]
+    table = reached.groupby(['mde_percent', 'alpha'])['sample_size'].min().unstack('alpha')
+    
+    all_mde = surface['mde_percent'].unique()
+    all_alpha = surface['alpha'].unique()
+    return table.reindex(index=all_mde, columns=all_alpha)
+
+
+def verify_analytic_sample_size(rv_discrete, config, engine='multinomial'):
+    """
+    Проверяет аналитический минимальный размер выборки эмуляцией.
+    
+    Параметры:
+    rv_discrete : scipy.stats.rv_discrete
+        Дискретное распределение для генерации выборок
+    config : dict
+        Конфигурация эксперимента (используется num_emulations)
+    engine : str
+        Движок эмуляции из словарей engines и stateful_engines
+        
+    Возвращает:
+    dict
+        sample_size - аналитический минимальный размер выборки (None, если не достижим),
+        analytic_power - мощность по формуле,
+        simulated_power - мощность по эмуляциям на том же размере выборки
+    """
+    sample_size = analytic_required_sample_size(rv_discrete, config, config.get('max_sample_size', MAX_SAMPLE_SIZE))
+    if sample_size is None:
+        return {'sample_size': None, 'analytic_power': None, 'simulated_power': None}
+    
+    analytic_power = analytic_power_curve(rv_discrete, config, [sample_size])['power'].iloc[0]
+    successful_tests = _get_engine(engine)(rv_discrete, sample_size, config['num_emulations'], config)
+    
+    return {
+        'sample_size': sample_size,
+        'analytic_power': analytic_power,
+        'simulated_power': successful_tests / config['num_emulations']
+    }
@@ -0,0 +1,188 @@
+"""
+Замеры времени по фазам эмуляции
+================================
+
+Показывает, на что run_experiment тратит время: генерацию выборок ('sampling':
+rv_discrete.rvs, мультиномиальные и биномиальные частоты), применение эффекта
+('effect': функции из get_effect_adder / get_moment_effect_adder) или тест
+('test': функции из get_test_method / get_moment_test_method).
+
+Движки получают активный PhaseTimer через current_phase_timer() и оборачивают
+функции фаз в timed / timed_iter. Без активного таймера обертки возвращают
+исходную функцию, поэтому выключенные замеры не добавляют работы в цикле эмуляций.
+Таймер хранится в contextvars: одновременные запуски в разных потоках
+(background_runner.py) не смешивают замеры. Процессы пула (n_jobs > 1) возвращают
+свои замеры вместе с результатом, поэтому время фаз там - сумма по процессам
+и может превышать время расчета.
+
+Пример использования:
+    results, metrics = run_experiment(rv_discrete, config, return_metrics=True)
+    metrics.phase_totals()   # время и число вызовов по фазам
+    metrics.to_frame()       # то же по каждому размеру выборки
+"""
+
+import contextvars
+from contextlib import contextmanager
+from time import perf_counter
+
+import pandas as pd
+
+# Фазы одной эмуляции
+PHASES = ('sampling', 'effect', 'test')
+
+_phase_timer = contextvars.ContextVar('phase_timer', default=None)
+
+
+class PhaseTimer:
+    """
+    Накопитель времени и числа вызовов по фазам.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self.calls = dict.fromkeys(PHASES, 0)
+
+    def add(self, phase, seconds, calls=1):
+        self.seconds[phase] += seconds
+        self.calls[phase] += calls
+
+    def wrap(self, phase, function):
+        """
+        Оборачивает функцию: каждый вызов добавляется к фазе phase.
+        """
+        def timed_function(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.add(phase, perf_counter() - start)
+        return timed_function
+
+    def iterate(self, phase, iterable):
+        """
+        Оборачивает итератор: время получения каждого элемента добавляется к фазе phase.
+        """
+        iterator = iter(iterable)
+        while True:
+            start = perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add(phase, perf_counter() - start, calls=0)
+                return
+            self.add(phase, perf_counter() - start)
+            yield item
+
+    def snapshot(self):
+        """
+        Текущие значения: {phase: {'seconds': ..., 'calls': ...}}.
+        """
+        return {phase: {'seconds': self.seconds[phase], 'calls': self.calls[phase]} for phase in PHASES}
+
+    def merge(self, snapshot):
+        """
+        Добавляет замеры, полученные из другого процесса.
+        """
+        for phase, values in snapshot.items():
+            self.add(phase, values['seconds'], values['calls'])
+
+
+def current_phase_timer():
+    """
+    Активный PhaseTimer текущего запуска (None, если замеры выключены).
+    """
+    return _phase_timer.get()
+
+
+@contextmanager
+def use_phase_timer(timer):
+    """
+    Делает timer активным на время блока with.
+    """
+    token = _phase_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        _phase_timer.reset(token)
+
+
+def timed(timer, phase, function):
+    """
+    Функция с замером фазы или исходная функция, если timer равен None.
+    """
+    return function if timer is None else timer.wrap(phase, function)
+
+
+def timed_iter(timer, phase, iterable):
+    """
+    Итератор с замером фазы или исходный итератор, если timer равен None.
+    """
+    return iterable if timer is None else timer.iterate(phase, iterable)
+
+
+class ExperimentMetrics:
+    """
+    Замеры одного запуска run_experiment по размерам выборки.
+
+    Атрибуты:
+    records : list
+        По записи на каждый оцененный размер выборки: sample_size, seconds (время
+        оценки размера), emulations, source ('emulation', 'cache' или 'checkpoint')
+        и phases - {phase: {'seconds', 'calls'}}
+    """
+
+    def __init__(self):
+        self.records = []
+
+    def record(self, sample_size, seconds, emulations, source, phases):
+        record = {
+            'sample_size': sample_size,
+            'seconds': seconds,
+            'emulations': emulations,
+            'source': source,
+            'phases': phases
+        }
+        self.records.append(record)
+        return record
+
+    @property
+    def total_seconds(self):
+        return sum(record['seconds'] for record in self.records)
+
+    def to_frame(self):
+        """
+        Длинная таблица: по строке на размер выборки и фазу.
+
+        Возвращает:
+        pd.DataFrame
+            Колонки sample_size, source, emulations, phase, seconds, calls
+        """
+        rows = [
+            {
+                'sample_size': record['sample_size'],
+                'source': record['source'],
+                'emulations': record['emulations'],
+                'phase': phase,
+                'seconds': values['seconds'],
+                'calls': values['calls']
+            }
+            for record in self.records
+            for phase, values in record['phases'].items()
+        ]
+        return pd.DataFrame(rows, columns=['sample_size', 'source', 'emulations', 'phase', 'seconds', 'calls'])
+
+    def phase_totals(self):
+        """
+        Суммарное время и число вызовов по фазам и их доля во времени запуска.
+
+        Возвращает:
+        pd.DataFrame
+            Индекс - фаза, колонки seconds, calls, share
+        """
+        totals = self.to_frame().groupby('phase')[['seconds', 'calls']].sum().reindex(list(PHASES), fill_value=0)
+        total_seconds = self.total_seconds
+        totals['share'] = totals['seconds'] / total_seconds if total_seconds > 0 else 0.0
+        return totals
@@ -0,0 +1,157 @@
+"""
+Кеш результатов эмуляций мощности
+=================================
+
+Хранит мощность по размерам выборки для уже посчитанных конфигураций, чтобы
+повторный запуск run_experiment на той же колонке (например, с другой целевой
+мощностью или пересекающимся диапазоном размеров выборки) эмулировал только
+недостающие точки.
+
+Ключ конфигурации: отпечаток дискретного распределения (xk, pk), statistic,
+test_method, alpha, mde_percent, num_emulations, engine и seed; для расчетов с
+seed также chunk_emulations - от разбиения на порции зависят случайные числа
+каждой эмуляции. Движки с состоянием ('incremental') кеш не используют: их
+мощность зависит от пути по размерам выборки. Точки хранятся в SQLite
+(стандартная библиотека) с ограничением по числу точек и вытеснением давно
+не использованных (LRU).
+
+Пример использования:
+    cache = PowerResultCache('~/.cache/mde_calculator/power_results.sqlite')
+    results = run_experiment(rv_discrete, config, result_cache=cache)
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+# Максимальное число точек (конфигурация, размер выборки) в кеше по умолчанию
+MAX_POINTS = 100_000
+
+# Поля конфигурации, определяющие результат эмуляций
+CONFIG_KEY_FIELDS = ('statistic', 'test_method', 'alpha', 'mde_percent', 'num_emulations', 'engine', 'seed')
+
+
+def distribution_fingerprint(rv_discrete):
+    """
+    Вычисляет отпечаток дискретного распределения по носителю и вероятностям.
+
+    Параметры:
+    rv_discrete : scipy.stats.rv_discrete или DiscreteSampler
+        Дискретное распределение
+
+    Возвращает:
+    str
+        Шестнадцатеричный хеш blake2b
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.ascontiguousarray(rv_discrete.xk, dtype=float).tobytes())
+    digest.update(np.ascontiguousarray(rv_discrete.pk, dtype=float).tobytes())
+    return digest.hexdigest()
+
+
+def make_config_key(rv_discrete, config):
+    """
+    Формирует ключ кеша по распределению и значимым полям конфигурации.
+    """
+    fields = {field: config.get(field) for field in CONFIG_KEY_FIELDS}
+    if fields['seed'] is not None:
+        # Генераторы воспроизводимого расчета привязаны к порциям эмуляций
+        fields['chunk_emulations'] = config.get('chunk_emulations')
+    fields['distribution'] = distribution_fingerprint(rv_discrete)
+    return json.dumps(fields, sort_keys=True)
+
+
+class PowerResultCache:
+    """
+    Хранилище мощности по размерам выборки в файле SQLite.
+
+    Параметры:
+    path : str
+        Путь к файлу базы (':memory:' не поддерживается - соединение открывается на каждую операцию)
+    max_points : int
+        Максимальное число хранимых точек, лишние вытесняются по давности использования
+    """
+
+    def __init__(self, path, max_points=MAX_POINTS):
+        self.path = os.path.expanduser(path)
+        self.max_points = max_points
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS power_points ("
+                " config_key TEXT NOT NULL,"
+                " sample_size INTEGER NOT NULL,"
+                " power REAL NOT NULL,"
+                " emulations INTEGER NOT NULL,"
+                " last_used REAL NOT NULL,"
+                " PRIMARY KEY (config_key, sample_size))"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON power_points (last_used)")
+
+    @contextmanager
+    def _connect(self):
+        # Отдельное соединение на операцию: кеш можно использовать из фонового потока
+        connection = sqlite3.connect(self.path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def get(self, config_key, sample_size):
+        """
+        Возвращает (power, emulations) для размера выборки или None.
+        """
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT power, emulations FROM power_points WHERE config_key = ? AND sample_size = ?",
+                (config_key, int(sample_size))
+            ).fetchone()
+            if row is not None:
+                connection.execute(
+                    "UPDATE power_points SET last_used = ? WHERE config_key = ? AND sample_size = ?",
+                    (time.time(), config_key, int(sample_size))
+                )
+        return row
+
+    def put(self, config_key, sample_size, power, emulations):
+        """
+        Сохраняет точку и вытесняет самые давние точки сверх max_points.
+        """
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO power_points VALUES (?, ?, ?, ?, ?)",
+                (config_key, int(sample_size), float(power), int(emulations), time.time())
+            )
+            connection.execute(
+                "DELETE FROM power_points WHERE rowid IN ("
+                " SELECT rowid FROM power_points ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_points,)
+            )
+
+    def points(self, config_key):
+        """
+        Возвращает все сохраненные точки конфигурации: {sample_size: (power, emulations)}.
+        """
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT sample_size, power, emulations FROM power_points WHERE config_key = ? ORDER BY sample_size",
+                (config_key,)
+            ).fetchall()
+        return {sample_size: (power, emulations) for sample_size, power, emulations in rows}
+
+    def clear(self):
+        """
+        Удаляет все точки.
+        """
+        with self._connect() as connection:
+            connection.execute("DELETE FROM power_points")
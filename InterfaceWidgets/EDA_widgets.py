@@ -17,10 +17,9 @@ import EDA.EDA as eda
 from IPython.display import display, clear_output
 import pandas as pd
 import ipywidgets as widgets
-import plotly.graph_objects as go
 
 
-def run_eda_analysis(selected_column, data_dict, on_eda_complete=None):
+def run_eda_analysis(selected_column, data_dict, on_eda_complete=None, df_dist=None, pdf_method='gaussian_kde'):
     """
     Запускает EDA анализ для выбранной колонки.
     
@@ -28,6 +27,8 @@ def run_eda_analysis(selected_column, data_dict, on_eda_complete=None):
         selected_column (str): Название выбранной колонки
         data_dict (dict): Словарь с данными, содержащий DataFrame в ключе 'df'
         on_eda_complete (callable): Функция обратного вызова после завершения EDA
+        df_dist (pd.DataFrame, optional): Дискретное распределение для точной эмпирической CDF
+        pdf_method (str): Метод оценки плотности для CDF без df_dist ('gaussian_kde' или 'fft')
     """
     # Получаем данные для выбранной колонки
     series = data_dict['df'][selected_column]
@@ -42,7 +43,7 @@ def run_eda_analysis(selected_column, data_dict, on_eda_complete=None):
     
     try:
         # Запускаем EDA анализ
-        eda_results = eda.EDA(series)
+        eda_results = eda.EDA(series, pdf_method=pdf_method, df_dist=df_dist)
         
         # Выводим статистики в виде датафреймов
         with stats_output:
@@ -58,35 +59,13 @@ def run_eda_analysis(selected_column, data_dict, on_eda_complete=None):
         with vis_output:
             print("Visualizations:")
         
-        try:
-            # Получаем только гистограмму (первый график)
-            histogram_fig = eda_results['visualizations']['multiplot'][0]
-            
-            # Преобразуем обычную фигуру в FigureWidget
-            fig_data = histogram_fig.data
-            fig_layout = histogram_fig.layout
-            
-            # Создаем FigureWidget с теми же данными и макетом
-            figure_widget = go.FigureWidget(data=fig_data, layout=fig_layout)
-            
-            # Отображаем FigureWidget напрямую (он сам является виджетом)
-            display(figure_widget)
-            
-        except Exception as e:
-            print(f"Ошибка при отображении гистограммы: {str(e)}")
-        
-        # Преобразуем и выводим остальные графики как FigureWidget
-        for i, graph in enumerate(eda_results['visualizations']['multiplot']):
-            if i > 0:  # Пропускаем гистограмму, она уже отображена
-                # Преобразуем обычную фигуру в FigureWidget
-                fig_data = graph.data
-                fig_layout = graph.layout
-                
-                # Создаем FigureWidget с теми же данными и макетом
-                figure_widget = go.FigureWidget(data=fig_data, layout=fig_layout)
-                
-                # Отображаем FigureWidget напрямую
-                display(figure_widget)
+        # Отображаем графики напрямую, без копирования в FigureWidget:
+        # фигуры уже содержат агрегированные данные и рендерятся один раз
+        for graph in eda_results['visualizations']['multiplot']:
+            try:
+                display(graph)
+            except Exception as e:
+                print(f"Ошибка при отображении графика: {str(e)}")
                 
         # Отображаем виджет для информации о распределении после всех графиков
         # Получаем доступ к distribution_info_output из родительского модуля
@@ -19,160 +19,183 @@ def load_credentials():
     except (FileNotFoundError, json.JSONDecodeError):
         return '', ''
 
-# Загружаем учетные данные
-default_login, default_password = load_credentials()
 
 # ============= Глобальные переменные =============
 current_method = 'digger'  # Текущий выбранный метод загрузки данных
-form_container = widgets.Output()  # Контейнер для отображения форм
-
-# ============= Создание карточек выбора метода =============
-digger_card = widgets.Button(
-    description='Загрузка из Digger',
-    icon='search',
-    tooltip='Загрузка данных из Digger',
-    layout=widgets.Layout(
-        width='200px',
-        height='150px',
-        border='2px solid rgb(146, 230, 167)',
-        border_radius='8px',
-        margin='10px'
-    ),
-    style=dict(
-        button_color='#e7eeff',
-        font_weight='bold'
-    )
-)
-
-file_card = widgets.Button(
-    description='Загрузка из CSV',
-    icon='upload',
-    tooltip='Загрузка локального CSV файла',
-    layout=widgets.Layout(
-        width='200px',
-        height='150px',
-        border='2px solid #dee2e6',
-        border_radius='8px',
-        margin='10px'
-    ),
-    style=dict(
-        button_color='white',
-        font_weight='bold'
-    )
-)
-
-# ============= Создание элементов ввода =============
-# Поля ввода для Digger
-login_input = widgets.Text(
-    value=default_login,
-    description='Логин:',
-    placeholder='i.ivanov',
-    style=dict(description_width='100px')
-)
-
-password_input = widgets.Password(
-    value=default_password,
-    description='Пароль:',
-    style=dict(description_width='100px')
-)
-
-query_input = widgets.Text(
-    description='ID запроса/Ссылка:',
-    placeholder='Введите идентификатор запроса',
-    style=dict(description_width='100px')
-)
-
-# Поле загрузки файла
-file_upload = widgets.FileUpload(
-    accept='.csv',
-    multiple=False,
-    description='Выберите файл:',
-    layout=widgets.Layout(width='400px')
-)
-
-# Добавляем виджет для отображения статуса
-loading_status = widgets.HTML(
-    value='',
-    layout=widgets.Layout(margin='10px 0px')
-)
-
-# Создаем контейнер для виджета статуса
-status_container = widgets.VBox([
-    loading_status
-], layout=widgets.Layout(display='none'))  # Скрываем по умолчанию
-
-# ============= Создание кнопок действий =============
-digger_execute_button = widgets.Button(
-    description='Выполнить запрос',
-    icon='play',
-    style=dict(button_color='#4CAF50', font_weight='bold'),
-    layout=widgets.Layout(width='200px', margin='10px 0px')
-)
-
-file_process_button = widgets.Button(
-    description='Обработать файл',
-    icon='play',
-    style=dict(button_color='#4CAF50', font_weight='bold'),
-    layout=widgets.Layout(width='200px', margin='10px 0px')
-)
-
-# ============= Создание форм =============
-digger_form = widgets.VBox([
-    widgets.HTML(value='<h3>Авторизация в Digger</h3>'),
-    login_input,
-    password_input,
-    query_input,
-    digger_execute_button
-])
-
-file_form = widgets.VBox([
-    widgets.HTML(value='<h3>Загрузка файла CSV</h3>'),
-    file_upload,
-    widgets.Output(),
-    file_process_button
-])
-
-# ============= Создание контейнеров =============
-cards_container = widgets.HBox([
-    digger_card, file_card
-], layout=widgets.Layout(
-    justify_content='center',
-    margin='20px 0px'
-))
-
-config_output = widgets.Output()  # Контейнер для вывода конфигурации
+
+# Виджеты создаются при первом отображении интерфейса (_get_widgets),
+# чтобы импорт модуля не читал учетные данные и не создавал виджеты
+class _DataLoadWidgets:
+    """Виджеты интерфейса загрузки данных с подставленными сохраненными учетными данными"""
+
+    def __init__(self):
+        # Загружаем учетные данные
+        default_login, default_password = load_credentials()
+
+        self.form_container = widgets.Output()  # Контейнер для отображения форм
+
+        # ============= Создание карточек выбора метода =============
+        self.digger_card = widgets.Button(
+            description='Загрузка из Digger',
+            icon='search',
+            tooltip='Загрузка данных из Digger',
+            layout=widgets.Layout(
+                width='200px',
+                height='150px',
+                border='2px solid rgb(146, 230, 167)',
+                border_radius='8px',
+                margin='10px'
+            ),
+            style=dict(
+                button_color='#e7eeff',
+                font_weight='bold'
+            )
+        )
+
+        self.file_card = widgets.Button(
+            description='Загрузка из CSV',
+            icon='upload',
+            tooltip='Загрузка локального CSV файла',
+            layout=widgets.Layout(
+                width='200px',
+                height='150px',
+                border='2px solid #dee2e6',
+                border_radius='8px',
+                margin='10px'
+            ),
+            style=dict(
+                button_color='white',
+                font_weight='bold'
+            )
+        )
+
+        # ============= Создание элементов ввода =============
+        # Поля ввода для Digger
+        self.login_input = widgets.Text(
+            value=default_login,
+            description='Логин:',
+            placeholder='i.ivanov',
+            style=dict(description_width='100px')
+        )
+
+        self.password_input = widgets.Password(
+            value=default_password,
+            description='Пароль:',
+            style=dict(description_width='100px')
+        )
+
+        self.query_input = widgets.Text(
+            description='ID запроса/Ссылка:',
+            placeholder='Введите идентификатор запроса',
+            style=dict(description_width='100px')
+        )
+
+        # Поле загрузки файла
+        self.file_upload = widgets.FileUpload(
+            accept='.csv',
+            multiple=False,
+            description='Выберите файл:',
+            layout=widgets.Layout(width='400px')
+        )
+
+        # Добавляем виджет для отображения статуса
+        self.loading_status = widgets.HTML(
+            value='',
+            layout=widgets.Layout(margin='10px 0px')
+        )
+
+        # Создаем контейнер для виджета статуса
+        self.status_container = widgets.VBox([
+            self.loading_status
+        ], layout=widgets.Layout(display='none'))  # Скрываем по умолчанию
+
+        # ============= Создание кнопок действий =============
+        self.digger_execute_button = widgets.Button(
+            description='Выполнить запрос',
+            icon='play',
+            style=dict(button_color='#4CAF50', font_weight='bold'),
+            layout=widgets.Layout(width='200px', margin='10px 0px')
+        )
+
+        self.file_process_button = widgets.Button(
+            description='Обработать файл',
+            icon='play',
+            style=dict(button_color='#4CAF50', font_weight='bold'),
+            layout=widgets.Layout(width='200px', margin='10px 0px')
+        )
+
+        # ============= Создание форм =============
+        self.digger_form = widgets.VBox([
+            widgets.HTML(value='<h3>Авторизация в Digger</h3>'),
+            self.login_input,
+            self.password_input,
+            self.query_input,
+            self.digger_execute_button
+        ])
+
+        self.file_form = widgets.VBox([
+            widgets.HTML(value='<h3>Загрузка файла CSV</h3>'),
+            self.file_upload,
+            widgets.Output(),
+            self.file_process_button
+        ])
+
+        # ============= Создание контейнеров =============
+        self.cards_container = widgets.HBox([
+            self.digger_card, self.file_card
+        ], layout=widgets.Layout(
+            justify_content='center',
+            margin='20px 0px'
+        ))
+
+        self.config_output = widgets.Output()  # Контейнер для вывода конфигурации
+
+
+_widgets = None
+
+
+def _get_widgets():
+    """Возвращает виджеты интерфейса, создавая их при первом обращении"""
+    global _widgets
+    if _widgets is None:
+        _widgets = _DataLoadWidgets()
+    return _widgets
+
 
 # ============= Вспомогательные функции =============
 def update_card_styles():
     """Обновляет стили карточек в зависимости от выбранного метода"""
-    digger_card.style.button_color = 'white'
-    file_card.style.button_color = 'white'
-    digger_card.layout.border = '2px solid #dee2e6'
-    file_card.layout.border = '2px solid #dee2e6'
+    w = _get_widgets()
+    w.digger_card.style.button_color = 'white'
+    w.file_card.style.button_color = 'white'
+    w.digger_card.layout.border = '2px solid #dee2e6'
+    w.file_card.layout.border = '2px solid #dee2e6'
     
     if current_method == 'digger':
-        digger_card.style.button_color = '#e7eeff'
-        digger_card.layout.border = '2px solid #4a6baf'
+        w.digger_card.style.button_color = '#e7eeff'
+        w.digger_card.layout.border = '2px solid #4a6baf'
     else:
-        file_card.style.button_color = '#e7eeff'
-        file_card.layout.border = '2px solid #4a6baf'
+        w.file_card.style.button_color = '#e7eeff'
+        w.file_card.layout.border = '2px solid #4a6baf'
 
 def get_uploaded_files():
     """Возвращает список загруженных файлов"""
-    if isinstance(file_upload.value, dict):
-        return list(file_upload.value.values())
-    elif isinstance(file_upload.value, (tuple, list)):
-        return list(file_upload.value)
+    w = _get_widgets()
+    if isinstance(w.file_upload.value, dict):
+        return list(w.file_upload.value.values())
+    elif isinstance(w.file_upload.value, (tuple, list)):
+        return list(w.file_upload.value)
     return []
 
 def get_data_fetch_config(method):
     """Возвращает конфигурацию загрузки данных в зависимости от метода"""
+    w = _get_widgets()
     if method == 'digger':
         return {
             'type': 'digger',
-            'auth_login': login_input.value,
-            'auth_pass': password_input.value,
-            'query_id': query_input.value
+            'auth_login': w.login_input.value,
+            'auth_pass': w.password_input.value,
+            'query_id': w.query_input.value
         }
     else:
         uploaded_files = get_uploaded_files()
@@ -186,41 +209,46 @@ def get_data_fetch_config(method):
 def on_digger_click(b):
     """Обработчик нажатия на карточку Digger"""
     global current_method
+    w = _get_widgets()
     current_method = 'digger'
     update_card_styles()
-    with form_container:
-        form_container.clear_output()
-        display(digger_form)
+    with w.form_container:
+        w.form_container.clear_output()
+        display(w.digger_form)
 
 def on_file_click(b):
     """Обработчик нажатия на карточку File"""
     global current_method
+    w = _get_widgets()
     current_method = 'file'
     update_card_styles()
-    with form_container:
-        form_container.clear_output()
-        display(file_form)
+    with w.form_container:
+        w.form_container.clear_output()
+        display(w.file_form)
 
 # ============= Основная функция отображения =============
-def display_interface(on_data_loaded=None):
+def display_interface(on_data_loaded=None, snapshot_cache=None):
     """
     Отображает интерфейс загрузки данных
     Args:
         on_data_loaded: callback-функция, которая будет вызвана после успешной загрузки данных
+        snapshot_cache: DiggerSnapshotCache для повторных загрузок запроса без обращения к Digger
     """
+    w = _get_widgets()
+
     def on_digger_execute(b):
         """Обработчик выполнения запроса к Digger"""
         nonlocal on_data_loaded  # Важно! Добавляем nonlocal
         config = get_data_fetch_config('digger')
 
-        with config_output:
-            config_output.clear_output()
+        with w.config_output:
+            w.config_output.clear_output()
             errors = []
-            if not login_input.value.strip():
+            if not w.login_input.value.strip():
                 errors.append("Необходимо указать логин.")
-            if not password_input.value.strip():
+            if not w.password_input.value.strip():
                 errors.append("Необходимо указать пароль.")
-            if not query_input.value.strip():
+            if not w.query_input.value.strip():
                 errors.append("Необходимо указать ID запроса или ссылку.")
 
             if errors:
@@ -228,66 +256,66 @@ def display_interface(on_data_loaded=None):
                     print(f"Ошибка: {err}")
             else:
                 # Показываем контейнер статуса
-                status_container.layout.display = 'flex'
+                w.status_container.layout.display = 'flex'
                 
                 # Показываем статус загрузки
-                loading_status.value = '<div style="color: #4CAF50;">Загрузка данных из Digger...</div>'
+                w.loading_status.value = '<div style="color: #4CAF50;">Загрузка данных из Digger...</div>'
                 
                 try:
                     # Загружаем данные
-                    data = load_data_from_digger(config)
+                    data = load_data_from_digger(config, snapshot_cache)
                     
                     # Обновляем статус
-                    loading_status.value = '<div style="color: #4CAF50;">Загрузка завершена!</div>'
+                    w.loading_status.value = '<div style="color: #4CAF50;">Загрузка завершена!</div>'
                     
                     # Вызываем callback если он предоставлен
                     if on_data_loaded:
                         on_data_loaded(data)
                 
                 except Exception as e:
-                    loading_status.value = f'<div style="color: red;">Ошибка при загрузке: {str(e)}</div>'
+                    w.loading_status.value = f'<div style="color: red;">Ошибка при загрузке: {str(e)}</div>'
 
     def on_file_process(b):
         """Обработчик обработки файла"""
         nonlocal on_data_loaded
         config = get_data_fetch_config('file')
 
-        with config_output:
-            config_output.clear_output()
+        with w.config_output:
+            w.config_output.clear_output()
             uploaded_files = get_uploaded_files()
             if not uploaded_files:
                 print("Ошибка: Необходимо загрузить CSV-файл.")
             else:
                 # Показываем контейнер статуса
-                status_container.layout.display = 'flex'
+                w.status_container.layout.display = 'flex'
                 
                 # Показываем статус загрузки
-                loading_status.value = '<div style="color: #4CAF50;">Обработка CSV файла...</div>'
+                w.loading_status.value = '<div style="color: #4CAF50;">Обработка CSV файла...</div>'
                 
                 try:
                     # Загружаем данные через функцию из data_loader
                     data = load_data_from_csv(config)
                     
                     # Обновляем статус
-                    loading_status.value = '<div style="color: #4CAF50;">Обработка завершена!</div>'
+                    w.loading_status.value = '<div style="color: #4CAF50;">Обработка завершена!</div>'
                     
                     # Вызываем callback если он предоставлен
                     if on_data_loaded:
                         on_data_loaded(data)
                 
                 except Exception as e:
-                    loading_status.value = f'<div style="color: red;">Ошибка при обработке: {str(e)}</div>'
+                    w.loading_status.value = f'<div style="color: red;">Ошибка при обработке: {str(e)}</div>'
 
     # Привязка обработчиков
-    digger_card.on_click(on_digger_click)
-    file_card.on_click(on_file_click)
-    digger_execute_button.on_click(on_digger_execute)  # Привязываем локальные обработчики
-    file_process_button.on_click(on_file_process)      # Привязываем локальные обработчики
+    w.digger_card.on_click(on_digger_click)
+    w.file_card.on_click(on_file_click)
+    w.digger_execute_button.on_click(on_digger_execute)  # Привязываем локальные обработчики
+    w.file_process_button.on_click(on_file_process)      # Привязываем локальные обработчики
 
     # Отображение интерфейса
-    display(cards_container)
-    display(form_container)
-    display(status_container)
-    display(config_output)
-    with form_container:
-        display(digger_form)
\ No newline at end of file
+    display(w.cards_container)
+    display(w.form_container)
+    display(w.status_container)
+    display(w.config_output)
+    with w.form_container:
+        display(w.digger_form)
\ No newline at end of file
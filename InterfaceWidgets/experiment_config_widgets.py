@@ -1,6 +1,7 @@
 import ipywidgets as widgets
 from IPython.display import display, clear_output
 import json
+import os
 
 # ============= Создание виджетов для конфигурации =============
 # Заголовок интерфейса
@@ -67,12 +68,27 @@ statistic_dropdown = widgets.Dropdown(
 
 # Выбор метода статистического теста
 test_method_dropdown = widgets.Dropdown(
-    options=[('T-test', 't_test')], #('Z-proportion-test', 'z_proportion_test')
+    options=[('T-test', 't_test'), ('Z-proportion-test (бинарные метрики)', 'z_proportion_test')],
     value='t_test',
     description='Метод теста:',
     style=dict(description_width='150px')
 )
 
+# Выбор движка эмуляции (векторизованный блоками или поштучный цикл)
+engine_dropdown = widgets.Dropdown(
+    options=[
+        ('Векторизованный', 'batch'),
+        ('Мультиномиальный (по частотам)', 'multinomial'),
+        ('Биномиальный (бинарные метрики)', 'binomial'),
+        ('Инкрементальный (общие случайные числа)', 'incremental'),
+        ('Аналитический (без эмуляций)', 'analytic'),
+        ('Поштучный цикл', 'loop')
+    ],
+    value='batch',
+    description='Движок:',
+    style=dict(description_width='150px')
+)
+
 # Число прогонов эмуляции (не более 10 000)
 num_emulations_input = widgets.BoundedIntText(
     value=1000,
@@ -100,6 +116,57 @@ sample_step_input = widgets.IntText(
     layout=widgets.Layout(width='300px')
 )
 
+# Стратегия поиска минимального размера выборки
+search_dropdown = widgets.Dropdown(
+    options=[('Линейный перебор', 'linear'), ('Галоп + бисекция', 'bisect')],
+    value='linear',
+    description='Поиск:',
+    style=dict(description_width='150px')
+)
+
+# Точность бисекции (ширина итогового интервала размеров выборки)
+search_resolution_input = widgets.IntText(
+    value=50,
+    description='Точность поиска:',
+    style=dict(description_width='150px'),
+    layout=widgets.Layout(width='300px')
+)
+
+# Максимальный размер выборки (по умолчанию 100 000)
+max_sample_size_input = widgets.IntText(
+    value=100000,
+    description='Макс. выборка:',
+    style=dict(description_width='150px'),
+    layout=widgets.Layout(width='300px')
+)
+
+# Число процессов для параллельных эмуляций
+n_jobs_input = widgets.BoundedIntText(
+    value=1,
+    min=1,
+    max=os.cpu_count() or 1,
+    step=1,
+    description='Процессов:',
+    style=dict(description_width='150px'),
+    layout=widgets.Layout(width='300px')
+)
+
+# Seed для воспроизводимости (пусто - случайный запуск)
+seed_input = widgets.Text(
+    value='',
+    placeholder='пусто - случайный',
+    description='Seed:',
+    style=dict(description_width='150px'),
+    layout=widgets.Layout(width='300px')
+)
+
+# Ранняя остановка эмуляций вдали от целевой мощности
+early_stopping_checkbox = widgets.Checkbox(
+    value=False,
+    description='Ранняя остановка эмуляций',
+    style=dict(description_width='150px')
+)
+
 # Кнопка для запуска эмуляции
 run_emulation_button = widgets.Button(
     description='Запустить эмуляцию',
@@ -127,9 +194,16 @@ config_container = widgets.VBox([
     mde_with_stat_container,
     statistic_dropdown,
     test_method_dropdown,
+    engine_dropdown,
     num_emulations_input,
     sample_size_input,
     sample_step_input,
+    search_dropdown,
+    search_resolution_input,
+    max_sample_size_input,
+    n_jobs_input,
+    seed_input,
+    early_stopping_checkbox,
     run_emulation_button,
     config_output
 ])
@@ -153,6 +227,18 @@ def get_current_config():
         sample_size = 1000  # значение по умолчанию
         sample_step = 500   # значение по умолчанию
     
+    try:
+        search_resolution = int(search_resolution_input.value)
+        max_sample_size = int(max_sample_size_input.value)
+    except (ValueError, TypeError):
+        search_resolution = 50     # значение по умолчанию
+        max_sample_size = 100000   # значение по умолчанию
+    
+    try:
+        seed = int(seed_input.value) if seed_input.value.strip() else None
+    except ValueError:
+        seed = None  # некорректный seed - случайный запуск
+    
     config = {
         'alpha': alpha_dropdown.value,
         'target_power': target_power_input.value,
@@ -161,7 +247,14 @@ def get_current_config():
         'test_method': test_method_dropdown.value,
         'num_emulations': num_emulations_input.value,
         'sample_size': sample_size,
-        'sample_step': sample_step
+        'sample_step': sample_step,
+        'engine': engine_dropdown.value,
+        'search': search_dropdown.value,
+        'search_resolution': search_resolution,
+        'max_sample_size': max_sample_size,
+        'n_jobs': n_jobs_input.value,
+        'seed': seed,
+        'early_stopping': early_stopping_checkbox.value
     }
     return config
 
@@ -0,0 +1,87 @@
+import ipywidgets as widgets
+from IPython.display import display
+from ExperimentsCore.background_runner import start_experiment
+
+
+def display_experiment_run(rv_discrete, config, on_complete=None, on_progress_update=None, result_cache=None,
+                           checkpoint=None):
+    """
+    Запускает эксперимент в фоновом потоке и отображает прогресс и кнопку отмены.
+    Ноутбук остается доступным во время расчета.
+
+    Args:
+        rv_discrete: Дискретное распределение (rv_discrete или DiscreteSampler)
+        config: Конфигурация эксперимента
+        on_complete: callback-функция, вызываемая с ExperimentRun по завершении или отмене
+                     (из фонового потока; run.result() содержит посчитанные точки)
+        on_progress_update: дополнительный callback прогресса
+                            (current_size, power, target_power, iteration, total_iterations)
+        result_cache: PowerResultCache (опционально)
+        checkpoint: ExperimentCheckpoint (опционально) - продолжение прерванного расчета
+
+    Returns:
+        ExperimentRun: дескриптор запущенного расчета
+    """
+    # Прогресс-бар и статус расчета
+    progress_bar = widgets.FloatProgress(
+        value=0,
+        min=0,
+        max=1.0,
+        description='Прогресс:',
+        bar_style='info',
+        style={'bar_color': '#2C5E99'},
+        orientation='horizontal'
+    )
+
+    status_label = widgets.HTML(value='Запуск эксперимента...')
+
+    cancel_button = widgets.Button(
+        description='Отменить',
+        icon='stop',
+        button_style='danger',
+        layout=widgets.Layout(width='150px', margin='10px 0px')
+    )
+
+    def update_progress(current_size, power, target_power, iteration, total_iterations):
+        """Обновляет прогресс-бар и статус (вызывается из фонового потока)"""
+        progress_bar.value = min(iteration / total_iterations, 1.0)
+        status_label.value = (
+            f'Размер выборки: {current_size}, мощность: {power:.3f} '
+            f'(цель {target_power}), шаг {iteration}/{total_iterations}'
+        )
+        if on_progress_update:
+            on_progress_update(current_size, power, target_power, iteration, total_iterations)
+
+    run = start_experiment(rv_discrete, config, on_progress_update=update_progress, result_cache=result_cache,
+                           checkpoint=checkpoint)
+
+    def on_cancel_click(b):
+        """Обработчик нажатия на кнопку отмены"""
+        if run.cancel():
+            cancel_button.disabled = True
+            status_label.value = 'Отмена: завершается текущий блок эмуляций...'
+
+    def on_run_finished(finished_run):
+        """Обработчик завершения расчета"""
+        cancel_button.disabled = True
+        if finished_run.exception() is not None:
+            progress_bar.bar_style = 'danger'
+            status_label.value = f'<span style="color: red;">Ошибка: {finished_run.exception()}</span>'
+        elif finished_run.cancelled():
+            progress_bar.bar_style = 'warning'
+            status_label.value = f'Эксперимент отменен, посчитано точек: {len(finished_run.result())}'
+        else:
+            progress_bar.value = 1.0
+            progress_bar.bar_style = 'success'
+            status_label.value = 'Эксперимент завершен'
+
+        if on_complete:
+            on_complete(finished_run)
+
+    cancel_button.on_click(on_cancel_click)
+
+    # Отображение интерфейса до подписки на завершение: быстрый расчет может закончиться сразу
+    display(widgets.VBox([progress_bar, status_label, cancel_button]))
+    run.add_done_callback(on_run_finished)
+
+    return run
@@ -12,6 +12,8 @@
 - add_effect_for_mean: Трансформирует выборку для изменения среднего значения
 - add_effect_for_median: Трансформирует выборку для изменения медианы (заглушка для будущей реализации)
 - get_effect_adder: Возвращает нужную функцию трансформации по имени статистики
+- add_effect_for_mean_moments: Тот же эффект для среднего, применённый к выборочным моментам
+- get_moment_effect_adder: Возвращает функцию трансформации моментов по имени статистики
 """
 
 import numpy as np
@@ -56,12 +58,37 @@ def add_effect_for_median(sample, mde_percent):
     pass
 
 
+def add_effect_for_mean_moments(mean, var, mde_percent):
+    """
+    Применяет эффект add_effect_for_mean к выборочным моментам вместо самой выборки.
+    Сдвиг на долю среднего умножает среднее на (1 + MDE) и не меняет дисперсию.
+    
+    Параметры:
+    mean : numpy.ndarray или float
+        Выборочные средние (по одному на эмуляцию)
+    var : numpy.ndarray или float
+        Выборочные дисперсии (по одной на эмуляцию)
+    mde_percent : float
+        Процентное значение MDE (например, 5.0 для 5% эффекта)
+        
+    Возвращает:
+    tuple
+        (mean, var) экспериментальной выборки
+    """
+    return mean * (1 + mde_percent/100), var
+
+
 # Словарь доступных методов добавления эффекта
 effect_adders = {
     'mean': add_effect_for_mean,
     'median': add_effect_for_median,
 }
 
+# Словарь методов добавления эффекта к выборочным моментам
+moment_effect_adders = {
+    'mean': add_effect_for_mean_moments,
+}
+
 
 def get_effect_adder(statistic_name):
     """
@@ -75,4 +102,21 @@ def get_effect_adder(statistic_name):
     function
         Функция для трансформации выборки с учетом MDE
     """
-    return effect_adders[statistic_name]
\ No newline at end of file
+    return effect_adders[statistic_name]
+
+
+def get_moment_effect_adder(statistic_name):
+    """
+    Возвращает функцию трансформации выборочных моментов по имени статистики.
+    
+    Параметры:
+    statistic_name : str
+        Имя статистики ('mean' или другие в будущем)
+        
+    Возвращает:
+    function
+        Функция (mean, var, mde_percent) -> (mean, var) для экспериментальной группы
+    """
+    if statistic_name not in moment_effect_adders:
+        raise ValueError(f"Статистика '{statistic_name}' не поддерживает расчёт по моментам")
+    return moment_effect_adders[statistic_name]
@@ -0,0 +1,124 @@
+"""
+Polars-бэкенд для статистик EDA и построения дискретного распределения
+======================================================================
+
+Те же величины, что и pandas-функции из Statistics/statistics.py и
+discrete_dist_creation из ExperimentsCore/experiments_core.py, но за один
+проход ленивого запроса Polars:
+- summary_statistics: моменты, медиана и все квантили одной мульти-агрегацией
+- base_statistics, quantiles: совместимые по интерфейсу обертки
+- support_counts: частоты значений носителя через group_by + count
+
+Определения совпадают с pandas: дисперсия и стандартное отклонение с ddof=1,
+несмещенные асимметрия и эксцесс (excess), линейная интерполяция квантилей,
+пропуски (None и NaN) не учитываются.
+
+Модуль импортирует polars на верхнем уровне и подключается только через
+Statistics.statistics.get_statistics_backend('polars').
+"""
+
+import numpy as np
+import polars as pl
+
+# Уровни квантилей (совпадают с pandas-функцией quantiles)
+QUANTILE_LEVELS = {
+    'q5%': 0.05,
+    'q1': 0.25,
+    'q2': 0.5,
+    'q3': 0.75,
+    'q95%': 0.95,
+}
+
+
+def _to_polars(series):
+    """
+    Переводит pd.Series в pl.Series без индекса; NaN становятся пропусками, как в pandas.
+    """
+    return pl.Series('x', series.to_numpy(), nan_to_null=True)
+
+
+def _value(value):
+    """
+    Приводит скаляр Polars к типу результата pandas (None - NaN).
+    """
+    return np.nan if value is None else value
+
+
+def summary_statistics(series):
+    """
+    Вычисляет базовые статистики и квантили одним проходом.
+
+    Args:
+        series (pd.Series): Входной числовой ряд
+
+    Returns:
+        tuple: (base_statistics, quantiles) - словари с теми же ключами, что у pandas-функций
+    """
+    x = pl.col('x').drop_nulls()
+    aggregations = [
+        x.count().alias('count'),
+        x.n_unique().alias('nunique'),
+        x.mean().alias('mean'),
+        x.median().alias('median'),
+        x.std(ddof=1).alias('std'),
+        x.var(ddof=1).alias('var'),
+        x.skew(bias=False).alias('skewness'),
+        x.kurtosis(fisher=True, bias=False).alias('kurtosis'),
+        x.min().alias('min'),
+        x.max().alias('max'),
+    ]
+    aggregations += [
+        x.quantile(level, interpolation='linear').alias(name)
+        for name, level in QUANTILE_LEVELS.items()
+    ]
+
+    row = pl.LazyFrame([_to_polars(series)]).select(aggregations).collect().row(0, named=True)
+
+    base = {
+        'count': row['count'],
+        'nunique': row['nunique'],
+        **{key: _value(row[key]) for key in ('mean', 'median', 'std', 'var', 'skewness', 'kurtosis')}
+    }
+    quantiles = {key: _value(row[key]) for key in ('min', 'max', *QUANTILE_LEVELS)}
+    quantiles['iqr'] = quantiles['q3'] - quantiles['q1']
+
+    return base, quantiles
+
+
+def base_statistics(series):
+    """
+    Вычисляет основные статистические показатели (см. Statistics.statistics.base_statistics).
+    """
+    return summary_statistics(series)[0]
+
+
+def quantiles(series):
+    """
+    Вычисляет квантили и размах (см. Statistics.statistics.quantiles).
+    """
+    return summary_statistics(series)[1]
+
+
+def support_counts(values):
+    """
+    Подсчитывает частоты значений носителя.
+
+    Args:
+        values (numpy.ndarray): Округленные значения без пропусков
+
+    Returns:
+        tuple: (xk, counts) - отсортированные уникальные значения и их количества
+    """
+    values = np.asarray(values)
+    if values.dtype.kind == 'f':
+        # +0.0 приводит -0.0 к 0.0, чтобы ноль попадал в одну группу при любом знаке
+        values = values + 0.0
+    frame = pl.LazyFrame({'value': values})
+    counts = (
+        frame
+        .group_by('value')
+        .agg(pl.len().alias('count'))
+        .sort('value')
+        .collect()
+    )
+    return counts['value'].to_numpy(), counts['count'].to_numpy()
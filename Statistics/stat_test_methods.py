@@ -5,8 +5,9 @@
 Данный модуль реализует методы статистических тестов, применяемые в калькуляторе размера выборки для экспериментов с минимальным обнаруживаемым эффектом (MDE).
 
 Возможности модуля:
-- Реализация отдельных методов тестирования (t-тест, z-тест)
-- Селектор функций для динамического выбора подходящего метода тестирования
+- Реализация отдельных методов тестирования (t-тест, z-тест для пропорций)
+- Векторизованные версии тестов, работающие по выборочным моментам сразу для всех эмуляций
+- Селекторы функций для динамического выбора подходящего метода тестирования
 
 Методы, реализованные в этом модуле, используются экспериментальным движком для определения, позволяет ли симулированный эксперимент обнаружить минимальный эффект при заданном размере выборки.
 
@@ -32,11 +33,23 @@ Returns:
 3. В рамках каждой симуляции генерирует выборки и вызывает:
        p_value, is_significant = test_function(control_sample, experiment_sample, alpha)
 4. Отслеживает долю симуляций, где is_significant=True, для расчёта мощности теста
+
+Интерфейс тестовой функции по моментам
+--------------------------------------
+Векторизованные движки не хранят сами выборки, а передают их выборочные моменты.
+Все аргументы могут быть массивами numpy (одна позиция - одна эмуляция):
+
+Args:
+    mean1, var1, n1: среднее, несмещённая дисперсия и размер контрольной выборки
+    mean2, var2, n2: то же для экспериментальной выборки
+    alpha (float): Уровень значимости
+
+Returns:
+    tuple: (p_values, is_significant) - массивы той же формы, что и входные моменты
 """
 
 import numpy as np
 from scipy import stats
-from statsmodels.stats.proportion import proportions_ztest
 
 
 def t_test(control_sample, experiment_sample, alpha):
@@ -61,7 +74,8 @@ def t_test(control_sample, experiment_sample, alpha):
 
 def z_proportion_test(control_sample, experiment_sample, alpha):
     """
-    Выполняет z-test для сравнения двух пропорций.
+    Выполняет z-test для сравнения двух пропорций (объединенная оценка дисперсии,
+    как в statsmodels.proportions_ztest) по закрытой формуле.
     Параметры:
     control_sample : numpy.ndarray
         Выборка контрольной группы из rv_discrete.sample().
@@ -73,12 +87,69 @@ def z_proportion_test(control_sample, experiment_sample, alpha):
     tuple
         (p_value, p_value < alpha)
     """
-    count1 = np.sum(control_sample)
-    count2 = np.sum(experiment_sample)
     nobs1 = len(control_sample)
     nobs2 = len(experiment_sample)
     
-    stat, p_value = proportions_ztest([count1, count2], [nobs1, nobs2])
+    # Доли считаются как средние, дисперсия в формуле не используется
+    p_value, is_significant = z_proportion_test_moments(
+        np.mean(control_sample), None, nobs1, np.mean(experiment_sample), None, nobs2, alpha
+    )
+    
+    return float(p_value), bool(is_significant)
+
+
+def t_test_moments(mean1, var1, n1, mean2, var2, n2, alpha):
+    """
+    Выполняет t-test (равные дисперсии, как в stats.ttest_ind) по выборочным моментам.
+    
+    Параметры:
+    mean1, var1, n1 : numpy.ndarray или float
+        Среднее, несмещённая дисперсия (ddof=1) и размер контрольной выборки.
+    mean2, var2, n2 : numpy.ndarray или float
+        Среднее, несмещённая дисперсия (ddof=1) и размер экспериментальной выборки.
+    alpha : float
+        Уровень значимости.
+    Возвращает:
+    tuple
+        (p_values, p_values < alpha) - массивы по всем эмуляциям
+    """
+    dof = n1 + n2 - 2
+    pooled_var = ((n1 - 1) * var1 + (n2 - 1) * var2) / dof
+    std_err = np.sqrt(pooled_var * (1.0 / n1 + 1.0 / n2))
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_stat = (mean1 - mean2) / std_err
+    p_value = 2 * stats.t.sf(np.abs(t_stat), dof)
+    
+    return p_value, p_value < alpha
+
+
+def z_proportion_test_moments(mean1, var1, n1, mean2, var2, n2, alpha):
+    """
+    Выполняет z-test для двух пропорций по выборочным долям (средним бинарной метрики).
+    Дисперсия берется из объединенной доли, поэтому var1 и var2 не используются.
+    
+    Параметры:
+    mean1, var1, n1 : numpy.ndarray или float
+        Доля успехов, дисперсия (не используется) и размер контрольной выборки.
+    mean2, var2, n2 : numpy.ndarray или float
+        То же для экспериментальной выборки.
+    alpha : float
+        Уровень значимости.
+    Возвращает:
+    tuple
+        (p_values, p_values < alpha) - массивы по всем эмуляциям
+    """
+    # Эффект в среднем может вывести долю за 1: доля ограничивается отрезком [0, 1]
+    mean1 = np.clip(mean1, 0.0, 1.0)
+    mean2 = np.clip(mean2, 0.0, 1.0)
+    pooled = (mean1 * n1 + mean2 * n2) / (n1 + n2)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        std_err = np.sqrt(pooled * (1 - pooled) * (1.0 / n1 + 1.0 / n2))
+        z_stat = (mean1 - mean2) / std_err
+    # Нулевая дисперсия (обе доли 0 или обе 1) - различия нет, p-value равно 1
+    p_value = np.where(std_err > 0, 2 * stats.norm.sf(np.abs(z_stat)), 1.0)
     
     return p_value, p_value < alpha
 
@@ -89,6 +160,12 @@ test_methods = {
     'z_proportion_test': z_proportion_test,
 }
 
+# Словарь тестов, работающих по выборочным моментам
+moment_test_methods = {
+    't_test': t_test_moments,
+    'z_proportion_test': z_proportion_test_moments,
+}
+
 
 def get_test_method(method_name):
     """
@@ -102,4 +179,21 @@ def get_test_method(method_name):
     function
         Функция тестирования, соответствующая указанному в конфиге имени теста.
     """
-    return test_methods[method_name]
\ No newline at end of file
+    return test_methods[method_name]
+
+
+def get_moment_test_method(method_name):
+    """
+    Возвращает векторизованную функцию тестирования по моментам по её имени в конфиге.
+    
+    Параметры:
+    method_name : str
+        Имя метода тестирования из словаря moment_test_methods.
+        
+    Возвращает:
+    function
+        Функция тестирования по моментам, соответствующая указанному в конфиге имени теста.
+    """
+    if method_name not in moment_test_methods:
+        raise ValueError(f"Тест '{method_name}' не поддерживает векторизованный расчёт по моментам")
+    return moment_test_methods[method_name]
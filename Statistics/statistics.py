@@ -1,18 +1,53 @@
+import importlib
 import pandas as pd
 import numpy as np
 from scipy import stats
 
+# Минимальный и максимальный размер сетки KDE с FFT-сверткой
+FFT_KDE_GRID_SIZE = 2048
+FFT_KDE_MAX_GRID_SIZE = 2 ** 20
 
-def base_statistics(series):
+# Узлов сетки на одну ширину ядра
+FFT_KDE_POINTS_PER_BANDWIDTH = 8
+
+# Словарь альтернативных вычислительных бэкендов (модули импортируются при первом обращении)
+statistics_backends = {
+    'polars': 'Statistics.polars_backend',
+}
+
+
+def get_statistics_backend(backend_name):
+    """
+    Возвращает модуль вычислительного бэкенда по имени.
+    
+    Args:
+        backend_name (str): Имя бэкенда из statistics_backends
+        
+    Returns:
+        module: Модуль с функциями summary_statistics, base_statistics, quantiles и support_counts
+    """
+    if backend_name not in statistics_backends:
+        raise ValueError(f"Неизвестный вычислительный бэкенд: '{backend_name}'")
+    try:
+        return importlib.import_module(statistics_backends[backend_name])
+    except ImportError as e:
+        raise ImportError(f"Бэкенд '{backend_name}' требует установленного пакета: {e.name}") from e
+
+
+def base_statistics(series, backend='pandas'):
     """
     Вычисляет основные статистические показатели для числового ряда.
     
     Args:
         series (pd.Series): Входной числовой ряд
+        backend (str): 'pandas' (по умолчанию) или имя бэкенда из statistics_backends
         
     Returns:
         dict: Словарь с основными статистическими показателями
     """
+    if backend != 'pandas':
+        return get_statistics_backend(backend).base_statistics(series)
+    
     return {
         'count': series.count(),
         'nunique': series.nunique(),
@@ -25,48 +60,143 @@ def base_statistics(series):
     }
 
 
-def quantiles(series):
+def quantiles(series, backend='pandas'):
     """
     Вычисляет квантили и размах для числового ряда.
     
     Args:
         series (pd.Series): Входной числовой ряд
+        backend (str): 'pandas' (по умолчанию) или имя бэкенда из statistics_backends
         
     Returns:
         dict: Словарь с квантилями и размахом
     """
+    if backend != 'pandas':
+        return get_statistics_backend(backend).quantiles(series)
+    
+    # Все квантили за одну сортировку
+    q5, q1, q2, q3, q95 = series.quantile([0.05, 0.25, 0.5, 0.75, 0.95]).values
+    
     return {
         'min': series.min(),
         'max': series.max(),
-        'q5%': series.quantile(0.05),
-        'q1': series.quantile(0.25),
-        'q2': series.quantile(0.5),
-        'q3': series.quantile(0.75),
-        'q95%': series.quantile(0.95),
-        'iqr': series.quantile(0.75) - series.quantile(0.25)
+        'q5%': q5,
+        'q1': q1,
+        'q2': q2,
+        'q3': q3,
+        'q95%': q95,
+        'iqr': q3 - q1
     }
 
 
-def pdf_creation(series, n_points=100):
+def summary_statistics(series, backend='pandas'):
+    """
+    Вычисляет базовые статистики и квантили.
+    Для бэкенда polars - одним проходом по данным.
+    
+    Args:
+        series (pd.Series): Входной числовой ряд
+        backend (str): 'pandas' (по умолчанию) или имя бэкенда из statistics_backends
+        
+    Returns:
+        tuple: (base_statistics, quantiles)
+    """
+    if backend != 'pandas':
+        return get_statistics_backend(backend).summary_statistics(series)
+    
+    return base_statistics(series), quantiles(series)
+
+
+def _kde_bandwidth(data):
+    """
+    Ширина ядра по правилу Скотта (как у scipy.stats.gaussian_kde по умолчанию).
+    """
+    return np.std(data, ddof=1) * len(data) ** (-1 / 5)
+
+
+def _pdf_gaussian_kde(data, x):
+    """
+    Точная KDE: O(N × n_points).
+    """
+    kde = stats.gaussian_kde(data)
+    return kde(x)
+
+
+def _pdf_binned_fft(data, x, grid_size=FFT_KDE_GRID_SIZE):
+    """
+    KDE с линейным биннингом на равномерной сетке и сверткой с гауссовым ядром через FFT.
+    Данные проходятся один раз (биннинг), далее время зависит только от размера сетки.
+    """
+    bandwidth = _kde_bandwidth(data)
+    if not bandwidth > 0:
+        raise ValueError("KDE не определена для вырожденного ряда (стандартное отклонение = 0)")
+    
+    # Сетка с запасом в 4 ширины ядра, чтобы хвосты плотности не обрезались;
+    # на ширину ядра должно приходиться не меньше FFT_KDE_POINTS_PER_BANDWIDTH узлов
+    low = data.min() - 4 * bandwidth
+    high = data.max() + 4 * bandwidth
+    required_size = int(np.ceil((high - low) / bandwidth * FFT_KDE_POINTS_PER_BANDWIDTH)) + 1
+    grid_size = int(np.clip(required_size, grid_size, FFT_KDE_MAX_GRID_SIZE))
+    step = (high - low) / (grid_size - 1)
+    
+    # Линейный биннинг: каждое значение делится между двумя соседними узлами
+    position = (data - low) / step
+    left = np.minimum(np.floor(position).astype(np.int64), grid_size - 2)
+    weight = position - left
+    counts = (np.bincount(left, weights=1 - weight, minlength=grid_size)
+              + np.bincount(left + 1, weights=weight, minlength=grid_size))
+    
+    # Ядро на сетке до 4 ширин в каждую сторону
+    radius = min(int(np.ceil(4 * bandwidth / step)), grid_size - 1)
+    offsets = np.arange(-radius, radius + 1) * step
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2) / (bandwidth * np.sqrt(2 * np.pi))
+    
+    # Линейная (не циклическая) свертка через FFT с дополнением нулями
+    fft_size = 1 << int(np.ceil(np.log2(grid_size + 2 * radius + 1)))
+    convolved = np.fft.irfft(np.fft.rfft(counts, fft_size) * np.fft.rfft(kernel, fft_size), fft_size)
+    density = np.maximum(convolved[radius:radius + grid_size], 0) / len(data)
+    
+    grid = low + step * np.arange(grid_size)
+    return np.interp(x, grid, density)
+
+
+# Словарь методов оценки плотности
+pdf_methods = {
+    'gaussian_kde': _pdf_gaussian_kde,
+    'fft': _pdf_binned_fft,
+}
+
+
+def get_pdf_method(method_name):
+    """
+    Возвращает функцию оценки плотности (data, x) -> density по имени.
+    """
+    if method_name not in pdf_methods:
+        raise ValueError(f"Неизвестный метод оценки плотности: '{method_name}'")
+    return pdf_methods[method_name]
+
+
+def pdf_creation(series, n_points=100, method='gaussian_kde'):
     """
     Создает оценку функции плотности вероятности (PDF) для числового ряда.
     
     Args:
         series (pd.Series): Входной числовой ряд
         n_points (int): Количество точек для построения PDF
+        method (str): 'gaussian_kde' - точная KDE scipy, O(N × n_points);
+                      'fft' - KDE с линейным биннингом и FFT-сверткой, O(N + размер сетки)
         
     Returns:
         pd.DataFrame: DataFrame с колонками 'x' и 'density' для построения PDF
     """
     # Очищаем данные от пропущенных значений
-    data = series.dropna()
+    data = series.dropna().to_numpy(dtype=float)
     
     # Создаем точки для построения PDF
     x = np.linspace(data.min(), data.max(), n_points)
     
     # Оцениваем плотность вероятности с помощью kernel density estimation
-    kde = stats.gaussian_kde(data)
-    y = kde(x)
+    y = get_pdf_method(method)(data, x)
     
     # Создаем DataFrame
     df = pd.DataFrame({